@@ -2,11 +2,18 @@
 charts.py — Todas as figuras Plotly e helpers de visualização.
 Nenhuma chamada a st.* aqui — só retorna go.Figure prontos para renderizar.
 """
+import datetime as dt
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
 from settings import (IPCA_GRUPOS_IDS, IPCA_GRUPOS_CORES, BCB_TOLE, COR_IPCA_LINHA,
-                       H_MEDIUM, H_LARGE, H_XLARGE, H_MONITOR, H_ACUM, H_COMP, H_GROUP, H_GRUPOS)
+                       H_MEDIUM, H_LARGE, H_XLARGE, H_MONITOR, H_ACUM, H_COMP, H_GROUP, H_GRUPOS,
+                       FIG_CACHE_MAX, LTTB_PONTOS)
 
 # ── IDs dos grupos para filtro ────────────────────────────────────────────────
 _GRUPO_IDS = [g.strip() for g in IPCA_GRUPOS_IDS.split(",")]
@@ -49,8 +56,117 @@ _RS_STYLE = dict(
 )
 
 
+# ── Cache de figuras ──────────────────────────────────────────────────────────
+# LRU por processo: a mesma figura (mesma versão de série, transformação,
+# janela, tipo e altura) é montada uma vez e servida a todas as sessões.
+# Figuras do cache são só lidas — render_chart não as altera.
+_FIGURAS      = OrderedDict()
+_FIGURAS_LOCK = threading.Lock()
+
+
+def _chave_df(df) -> tuple:
+    """
+    Identidade de um DataFrame/Series. Séries do cache de data.py trazem
+    attrs codigo/versao/transformacao — chave em O(1); o resto vira hash do conteúdo.
+    """
+    attrs = getattr(df, "attrs", {})
+    if "versao" in attrs and isinstance(df, pd.DataFrame) and "data" in df.columns and len(df):
+        return ("v", attrs.get("codigo"), attrs["versao"], attrs.get("transformacao"),
+                tuple(df.columns), len(df), df["data"].iat[0], df["data"].iat[-1])
+    colunas = tuple(df.columns) if isinstance(df, pd.DataFrame) else df.name
+    return ("h", colunas, df.shape, int(pd.util.hash_pandas_object(df, index=True).sum()))
+
+
+def _chave_arg(x):
+    if isinstance(x, (pd.DataFrame, pd.Series)):
+        return _chave_df(x)
+    if isinstance(x, dict):
+        return tuple((k, _chave_arg(v)) for k, v in x.items())
+    if isinstance(x, (list, tuple)):
+        return tuple(_chave_arg(v) for v in x)
+    if x is None or isinstance(x, (str, int, float, bool, pd.Timestamp, dt.date)):
+        return x
+    return repr(x)
+
+
+def _cache_figura(builder):
+    """Memoiza um builder de go.Figure pela chave (tipo, argumentos)."""
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        chave = (builder.__name__, _chave_arg(args), _chave_arg(sorted(kwargs.items())))
+        with _FIGURAS_LOCK:
+            fig = _FIGURAS.get(chave)
+            if fig is not None:
+                _FIGURAS.move_to_end(chave)
+                return fig
+        fig = builder(*args, **kwargs)
+        with _FIGURAS_LOCK:
+            _FIGURAS[chave] = fig
+            while len(_FIGURAS) > FIG_CACHE_MAX:
+                _FIGURAS.popitem(last=False)
+        return fig
+    return wrapper
+
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
+def _lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: índices de n pontos que preservam a forma
+    visual da série (picos e vales). Primeiro e último pontos sempre ficam;
+    o miolo é dividido em n-2 baldes e de cada um sai o ponto que forma o
+    maior triângulo com o ponto escolhido antes e a média do balde seguinte.
+    """
+    total = len(y)
+    if n >= total or n < 3:
+        return np.arange(total)
+    x = x.astype("float64")
+    bordas = np.linspace(1, total - 1, n - 1).astype(np.int64)
+    larg   = np.diff(bordas)
+    mx     = np.add.reduceat(x[:bordas[-1]], bordas[:-1]) / larg
+    my     = np.add.reduceat(y[:bordas[-1]], bordas[:-1]) / larg
+    idx    = np.empty(n, dtype=np.int64)
+    idx[0], idx[-1] = 0, total - 1
+    a = 0
+    for i in range(n - 2):
+        ini, fim = bordas[i], bordas[i + 1]
+        cx, cy   = (mx[i + 1], my[i + 1]) if i + 1 < n - 2 else (x[-1], y[-1])
+        area = np.abs((x[a] - cx) * (y[ini:fim] - y[a]) - (x[a] - x[ini:fim]) * (cy - y[a]))
+        a = ini + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def _reduzir(datas, valores, max_pontos, x_ini=None, x_fim=None) -> tuple:
+    """
+    (x, y) prontos para o traço, reduzidos por LTTB se passarem de max_pontos.
+    Com janela x_ini..x_fim o orçamento vale para a janela: os pontos visíveis
+    ficam todos (ou max_pontos via LTTB) e só o trecho fora dela — que aparece
+    no pan e na prévia do rangeslider — é reduzido, com o mesmo orçamento
+    repartido entre antes e depois proporcionalmente ao nº de pontos.
+    """
+    x = np.asarray(datas, dtype="datetime64[ns]")
+    y = np.asarray(valores, dtype="float64")
+    if not max_pontos or len(y) <= max_pontos:
+        return x, y
+    ok = np.isfinite(y)
+    x, y = x[ok], y[ok]
+    if x_ini is None or x_fim is None:
+        keep = _lttb(x.view("int64"), y, max_pontos)
+        return x[keep], y[keep]
+    xi = x.view("int64")
+    a  = int(np.searchsorted(x, np.datetime64(pd.Timestamp(x_ini), "ns"), side="left"))
+    b  = int(np.searchsorted(x, np.datetime64(pd.Timestamp(x_fim), "ns"), side="right"))
+    fora  = a + (len(y) - b)
+    cotas = [(0, a, max_pontos * a / fora if fora else 0),
+             (a, b, max_pontos),
+             (b, len(y), max_pontos * (len(y) - b) / fora if fora else 0)]
+    keep  = [ini + _lttb(xi[ini:fim], y[ini:fim], max(int(cota), 3))
+             for ini, fim, cota in cotas if fim > ini]
+    keep  = np.concatenate(keep)
+    return x[keep], y[keep]
+
+
 def hex_rgba(h: str, a: float = 0.08) -> str:
     """Converte cor hex (#rrggbb) para rgba com transparência."""
     h = h.lstrip("#")
@@ -122,18 +238,25 @@ def _add_rangeslider(fig: go.Figure, height: int, extra_top: int = 32) -> go.Fig
 
 # ── Gráficos genéricos ────────────────────────────────────────────────────────
 
+@_cache_figura
 def line_fig(df: pd.DataFrame, title: str, color: str = "#1a2035",
              fill: bool = True, suffix: str = "", height: int = 260,
-             inter: bool = False, x_ini=None, x_fim=None) -> go.Figure:
+             inter: bool = False, x_ini=None, x_fim=None,
+             max_pontos: int | None = LTTB_PONTOS) -> go.Figure:
     """
     Gráfico de linha.
     - inter=False: estático, sem controles.
     - inter=True + x_ini/x_fim: interativo com janela definida, rangeslider e Y ajustado.
     - inter=True sem x_ini/x_fim: interativo sem janela inicial (usa série completa).
+    - max_pontos: séries maiores são reduzidas por LTTB (None = todos os pontos);
+      com x_ini/x_fim o orçamento vale para a janela visível (ver _reduzir).
+      O range Y continua calculado sobre a série completa.
     """
+    _x, _y = _reduzir(df["data"], df["valor"], max_pontos,
+                      *((x_ini, x_fim) if inter else (None, None)))
     fig = go.Figure()
     fig.add_trace(go.Scatter(
-        x=df["data"], y=df["valor"],
+        x=_x, y=_y,
         mode="lines",
         line=dict(color=color, width=2),
         fill="tozeroy" if fill else "none",
@@ -150,6 +273,7 @@ def line_fig(df: pd.DataFrame, title: str, color: str = "#1a2035",
     return _rng(fig, df, suffix) if not df.empty else fig
 
 
+@_cache_figura
 def bar_fig(df: pd.DataFrame, title: str, suffix: str = "",
             height: int = 260, inter: bool = False,
             x_ini=None, x_fim=None) -> go.Figure:
@@ -161,7 +285,7 @@ def bar_fig(df: pd.DataFrame, title: str, suffix: str = "",
     fig = go.Figure()
     fig.add_trace(go.Bar(
         x=df["data"], y=df["valor"],
-        marker_color=["#16a34a" if v >= 0 else "#dc2626" for v in df["valor"]],
+        marker_color=np.where(df["valor"].to_numpy() >= 0, "#16a34a", "#dc2626"),
         marker_line_width=0,
         hovertemplate=f"%{{x|%d/%m/%Y}}<br><b>%{{y:.4f}}{suffix}</b><extra></extra>",
     ))
@@ -184,6 +308,7 @@ def bar_fig(df: pd.DataFrame, title: str, suffix: str = "",
 
 # ── Gráficos específicos de inflação ─────────────────────────────────────────
 
+@_cache_figura
 def cores_overlay_fig(df_ipca: pd.DataFrame, nucleo_data: dict,
                        height: int = 480, x_ini=None, x_fim=None) -> go.Figure:
     """IPCA headline + núcleos. x_ini/x_fim definem janela inicial."""
@@ -220,6 +345,7 @@ def cores_overlay_fig(df_ipca: pd.DataFrame, nucleo_data: dict,
     return _add_rangeslider(fig, height, extra_top=40)
 
 
+@_cache_figura
 def acum12m_meta_fig(df_ipca_full: pd.DataFrame, meta_val: float = 3.0,
                       x_ini=None, x_fim=None) -> go.Figure:
     """Acumulado 12M vs meta BCB com banda de tolerância."""
@@ -259,6 +385,7 @@ def acum12m_meta_fig(df_ipca_full: pd.DataFrame, meta_val: float = 3.0,
     return _add_rangeslider(fig, 320)
 
 
+@_cache_figura
 def grupos_bar_fig(df_grupos: pd.DataFrame, ultimo_mes) -> go.Figure:
     """Barras horizontais — snapshot mensal por grupo. Sempre estático."""
     df_m = df_grupos[
@@ -270,9 +397,9 @@ def grupos_bar_fig(df_grupos: pd.DataFrame, ultimo_mes) -> go.Figure:
     fig = go.Figure()
     fig.add_trace(go.Bar(
         x=df_m["valor"], y=df_m["grupo"], orientation="h",
-        marker_color=["#dc2626" if v >= 0 else "#16a34a" for v in df_m["valor"]],
+        marker_color=np.where(df_m["valor"].to_numpy() >= 0, "#dc2626", "#16a34a"),
         marker_line_width=0,
-        text=[f"{v:+.2f}%" for v in df_m["valor"]], textposition="outside",
+        texttemplate="%{x:+.2f}%", textposition="outside",
         hovertemplate="%{y}<br><b>%{x:.2f}%</b><extra></extra>",
     ))
     fig.update_layout(**{**_B, "margin": dict(l=185, r=70, t=44, b=36)},
@@ -284,6 +411,7 @@ def grupos_bar_fig(df_grupos: pd.DataFrame, ultimo_mes) -> go.Figure:
     return fig
 
 
+@_cache_figura
 def grupos_linhas_fig(df_grupos: pd.DataFrame, d_ini=None, d_fim=None,
                        height: int = H_GRUPOS) -> go.Figure:
     """Linhas de evolução mensal por grupo. d_ini/d_fim = janela inicial."""
@@ -314,50 +442,55 @@ def grupos_linhas_fig(df_grupos: pd.DataFrame, d_ini=None, d_fim=None,
                          suffix="%", height=height, extra_top=50, pad=0.2)
 
 
-def nucleos_acum12m_fig(df_all: pd.DataFrame, nucleo_data: dict,
-                         ipca_a12: pd.DataFrame, meta_bcb: float,
+@_cache_figura
+def nucleos_acum12m_fig(a12: pd.DataFrame, nucleo_data: dict, meta_bcb: float,
                          x_ini=None, x_fim=None) -> go.Figure:
     """
     Média dos núcleos acumulado 12M vs meta BCB.
-    df_all: DataFrame com colunas {key}_a12 e media_a12.
+    a12: matriz acum. 12M (data.transformar_matriz) — uma coluna por núcleo
+    (chaves de nucleo_data) e, opcionalmente, "IPCA" para a linha headline.
     """
     from settings import COR_MEDIA_NUCL
     piso_meta = meta_bcb - BCB_TOLE
     teto_meta = meta_bcb + BCB_TOLE
 
+    _keys = [k for k in nucleo_data if k in a12.columns]
+    nucl  = a12[_keys]
+    nucl  = nucl[nucl.notna().any(axis=1)]
+    m     = nucl.to_numpy()
+    datas = nucl.index
+    media = np.nanmean(m, axis=1)
+
     fig = go.Figure()
     # Banda de dispersão entre mín e máx dos núcleos
-    _acols = [f"{k}_a12" for k in nucleo_data if f"{k}_a12" in df_all.columns]
-    if _acols:
-        df_all["min_a12"] = df_all[_acols].min(axis=1)
-        df_all["max_a12"] = df_all[_acols].max(axis=1)
+    if _keys:
         fig.add_trace(go.Scatter(
-            x=pd.concat([df_all["data"], df_all["data"].iloc[::-1]]),
-            y=pd.concat([df_all["max_a12"], df_all["min_a12"].iloc[::-1]]),
+            x=np.concatenate([datas, datas[::-1]]),
+            y=np.concatenate([np.nanmax(m, axis=1), np.nanmin(m, axis=1)[::-1]]),
             fill="toself", fillcolor="rgba(139,92,246,0.10)",
             line=dict(color="rgba(0,0,0,0)"), hoverinfo="skip", showlegend=False,
         ))
     # Linhas individuais dos núcleos (pontilhadas)
-    for key, (_, label, color) in nucleo_data.items():
-        col_a = f"{key}_a12"
-        if col_a in df_all.columns:
-            fig.add_trace(go.Scatter(
-                x=df_all["data"], y=df_all[col_a],
-                mode="lines", name=key,
-                line=dict(color=color, width=1, dash="dot"), opacity=0.55,
-                hovertemplate=f"%{{x|%b/%Y}}<br>{key} acum. 12M: %{{y:.2f}}%<extra></extra>",
-            ))
+    for j, key in enumerate(_keys):
+        color = nucleo_data[key][2]
+        fig.add_trace(go.Scatter(
+            x=datas, y=m[:, j],
+            mode="lines", name=key,
+            line=dict(color=color, width=1, dash="dot"), opacity=0.55,
+            hovertemplate=f"%{{x|%b/%Y}}<br>{key} acum. 12M: %{{y:.2f}}%<extra></extra>",
+        ))
     # IPCA headline acum. 12M
-    if not ipca_a12.empty:
+    if "IPCA" in a12.columns:
+        ipca_a12 = a12["IPCA"].dropna()
         fig.add_trace(go.Scatter(
-            x=ipca_a12["data"], y=ipca_a12["acum12m"],
+            x=ipca_a12.index, y=ipca_a12.to_numpy(),
             mode="lines", name="IPCA acum. 12M",
             line=dict(color=COR_IPCA_LINHA, width=1.8, dash="dash"),
             hovertemplate="%{x|%b/%Y}<br>IPCA acum. 12M: %{y:.2f}%<extra></extra>",
         ))
     # Média dos núcleos (destaque)
     fig.add_trace(go.Scatter(
-        x=df_all["data"], y=df_all["media_a12"],
+        x=datas, y=media,
         mode="lines+markers", name="Média Núcleos acum. 12M",
         line=dict(color=COR_MEDIA_NUCL, width=2.5),
         marker=dict(size=6, color=COR_MEDIA_NUCL),
@@ -376,14 +509,14 @@ def nucleos_acum12m_fig(df_all: pd.DataFrame, nucleo_data: dict,
                     font=dict(size=10, color="#374151"), bgcolor="rgba(255,255,255,0)"),
     )
     # Anotação com último valor
-    last_val = df_all["media_a12"].iloc[-1]
+    last_val = float(media[-1])
     fig.add_annotation(
-        x=df_all["data"].iloc[-1], y=last_val,
+        x=datas[-1], y=last_val,
         text=f"  {last_val:.2f}%", showarrow=False,
         font=dict(size=11, color=COR_MEDIA_NUCL, family="Inter"), xanchor="left",
     )
     # Janela + rangeslider
-    df_vis = df_all[["data", "media_a12"]].rename(columns={"media_a12": "valor"})
+    df_vis = pd.DataFrame({"data": datas, "valor": media})
     if x_ini and x_fim:
         return _apply_window(fig, df_vis, x_ini, x_fim,
                              suffix="%", height=H_MONITOR, extra_top=40,
@@ -392,13 +525,14 @@ def nucleos_acum12m_fig(df_all: pd.DataFrame, nucleo_data: dict,
     return _add_rangeslider(fig, 360, extra_top=40)
 
 
+@_cache_figura
 def grupos_acum12m_fig(df_acum_u: pd.DataFrame, ult_acum,
                         meta_bcb: float) -> go.Figure:
     """Barras horizontais — acumulado 12M por grupo vs meta. Sempre estático."""
     teto_meta = meta_bcb + BCB_TOLE
     piso_meta = meta_bcb - BCB_TOLE
-    colors = ["#dc2626" if v > teto_meta else "#16a34a" if v < piso_meta else "#0891b2"
-              for v in df_acum_u["valor"]]
+    _v     = df_acum_u["valor"].to_numpy()
+    colors = np.select([_v > teto_meta, _v < piso_meta], ["#dc2626", "#16a34a"], "#0891b2")
     fig = go.Figure()
     fig.add_shape(type="rect", x0=piso_meta, x1=teto_meta,
                   y0=-0.5, y1=len(df_acum_u) - 0.5,
@@ -409,7 +543,7 @@ def grupos_acum12m_fig(df_acum_u: pd.DataFrame, ult_acum,
     fig.add_trace(go.Bar(
         x=df_acum_u["valor"], y=df_acum_u["grupo"], orientation="h",
         marker_color=colors, marker_line_width=0,
-        text=[f"{v:.1f}%" for v in df_acum_u["valor"]], textposition="outside",
+        texttemplate="%{x:.1f}%", textposition="outside",
         hovertemplate="%{y}<br><b>Acum. 12M: %{x:.2f}%</b><extra></extra>",
     ))
     fig.update_layout(
@@ -421,26 +555,30 @@ def grupos_acum12m_fig(df_acum_u: pd.DataFrame, ult_acum,
     return fig
 
 
-def comparacao_fig(series_comp: dict, selecionados: list,
-                   x_ini=None, x_fim=None) -> go.Figure:
+@_cache_figura
+def comparacao_fig(matriz: pd.DataFrame, unidades: dict, selecionados: list,
+                   x_ini=None, x_fim=None, max_pontos: int | None = LTTB_PONTOS) -> go.Figure:
     """
     Gráfico de comparação de séries com suporte a eixo Y duplo.
-    series_comp: {nome: (df, unidade)}
+    matriz: data.alinhar_series — uma coluna por série; unidades: {nome: unidade}
+    max_pontos: orçamento LTTB por série na janela x_ini..x_fim (None = todos os pontos).
     """
-    _unidades = list(dict.fromkeys(u for _, u in series_comp.values()))
+    _unidades = list(dict.fromkeys(unidades[n] for n in matriz.columns))
     _usa_y2   = len(_unidades) >= 2
 
     from settings import CORES_COMP
     fig  = go.Figure()
     cors = list(CORES_COMP)
+    m    = matriz.to_numpy()
 
-    for i, (_nome, (_df_c, _unit)) in enumerate(series_comp.items()):
-        if _df_c.empty:
-            continue
+    for i, _nome in enumerate(matriz.columns):
+        _ok   = ~np.isnan(m[:, i])          # cada série só nas próprias datas
+        _unit = unidades[_nome]
         _cor  = cors[i % len(cors)]
         _yref = "y2" if (_usa_y2 and _unit != _unidades[0]) else "y"
+        _x, _y = _reduzir(matriz.index[_ok], m[_ok, i], max_pontos, x_ini or None, x_fim or None)
         fig.add_trace(go.Scatter(
-            x=_df_c["data"], y=_df_c["valor"],
+            x=_x, y=_y,
             mode="lines", name=f"{_nome} ({_unit})",
             line=dict(color=_cor, width=2),
             yaxis=_yref,
@@ -464,10 +602,13 @@ def comparacao_fig(series_comp: dict, selecionados: list,
 
     fig.update_layout(**_layout, height=H_COMP, title=" vs ".join(selecionados))
 
-    # Combina todos os dfs para calcular Y range
-    _all_dfs = [df for df, _ in series_comp.values() if not df.empty]
-    if _all_dfs and x_ini and x_fim:
-        _df_combined = pd.concat(_all_dfs, ignore_index=True)
+    # Todas as colunas empilhadas para calcular Y range
+    if not matriz.empty and x_ini and x_fim:
+        _ok = ~np.isnan(m)
+        _df_combined = pd.DataFrame({
+            "data":  np.broadcast_to(matriz.index.to_numpy()[:, None], m.shape)[_ok],
+            "valor": m[_ok],
+        })
         return _apply_window(fig, _df_combined, x_ini, x_fim, height=H_COMP)
 
     return _add_rangeslider(fig, H_COMP)
@@ -5,20 +5,37 @@ Correções desta versão:
   - FTSE/DAX 0.00: chartPreviousClose pode ser 0 no payload; agora busca o
     último fechamento real no array de candles (indicators.quote.close)
   - Tiles vazios: substituídas 15 chamadas independentes de get_quote() por
-    get_all_quotes(symbols), que busca sequencialmente com espaçamento e
-    é cacheada como uma unidade — elimina o burst que causava 429
+    get_all_quotes(symbols), que busca em lotes (endpoint spark) ritmados por
+    um token bucket e é cacheada como uma unidade — elimina o burst que causava 429
 """
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import logging
 import warnings
 import requests
 import urllib3
+import numpy as np
 import pandas as pd
 import streamlit as st
 from datetime import datetime, timedelta
 import time
-import random
+import threading
+import itertools
+from http.cookiejar import LWPCookieJar
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import store
+from net import session_for, nova_sessao, limitador, taxas, circuitos
+from settings import (logger, TTL_BCB, TTL_IBGE, TTL_HIST, TTL_FOCUS, TTL_MERCADOS, SWR_RETRY,
+                      AQUECIMENTO_TICK, AQUECIMENTO_MARGEM,
+                      SGS, NUCLEO_SGS, GLOBAL,
+                      FOCUS_INDICADORES, FOCUS_INDICADORES_12M,
+                      SGS_RELEITURA_DIAS, BCB_MAX_CONEXOES, FOCUS_PAGINA, FOCUS_MAX_CONEXOES,
+                      YF_LOTE, YF_MAX_CONEXOES,
+                      YF_CRUMB_TTL, YF_CRUMB_ESPERA, YF_COOKIE_JAR, YF_HIST_ANOS, YF_HIST_RELEITURA_DIAS,
+                      COTACOES_INTERVALO, COTACOES_ESPERA)
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 warnings.filterwarnings("ignore", message="Unverified HTTPS")
@@ -32,6 +49,7 @@ SIDRA_BASE    = "https://servicodados.ibge.gov.br/api/v3/agregados"
 _YF_COOKIE_URL = "https://fc.yahoo.com"
 _YF_CRUMB_URL  = "https://query1.finance.yahoo.com/v1/test/getcrumb"
 _YF_CHART_URL  = "https://query2.finance.yahoo.com/v8/finance/chart/{sym}"
+_YF_SPARK_URL  = "https://query1.finance.yahoo.com/v7/finance/spark"
 
 HEADERS = {
     "User-Agent": (
@@ -58,6 +76,28 @@ def parse_bcb_valor(valor_str):
     except (ValueError, TypeError):
         return None
 
+def parse_bcb_series(valores: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de parse_bcb_valor — mesmo resultado, sem chamada Python
+    por linha. Fast path: o SGS devolve ponto decimal ("5.25"), que converte
+    direto com astype(float) em C; só se isso falhar (vírgula decimal, espaços,
+    NBSP, lixo) a coluna passa pela normalização com operações .str, e o que
+    ainda não for numérico vira NaN.
+    """
+    try:
+        return valores.astype(float)
+    except (ValueError, TypeError):
+        pass
+    s = (valores.astype(str).str.strip()
+         .str.replace("\xa0", "", regex=False).str.replace(" ", "", regex=False))
+    virgula = s.str.contains(",", regex=False)
+    if virgula.any():
+        s = s.where(~virgula, s.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    try:
+        return s.astype(float)
+    except (ValueError, TypeError):
+        return pd.to_numeric(s, errors="coerce").astype(float)
+
 def _build_df(raw: list) -> pd.DataFrame:
     if not raw:
         return pd.DataFrame(columns=["data", "valor"])
@@ -65,10 +105,33 @@ def _build_df(raw: list) -> pd.DataFrame:
     if "data" not in df.columns or "valor" not in df.columns:
         return pd.DataFrame(columns=["data", "valor"])
     df["data"]  = pd.to_datetime(df["data"], format="%d/%m/%Y", errors="coerce")
-    df["valor"] = df["valor"].apply(parse_bcb_valor)
+    df["valor"] = parse_bcb_series(df["valor"])
     df = df.dropna(subset=["data", "valor"]).sort_values("data").reset_index(drop=True)
     return df[["data", "valor"]]
 
+# Versão monotônica dos frames congelados — muda a cada build, nunca se repete
+_VERSOES = itertools.count(1)
+
+def _congelar(df: pd.DataFrame, codigo) -> pd.DataFrame:
+    """
+    Série [data, valor] imutável para o cache compartilhado: datas como int64
+    (ns) e valores float64 em arrays NumPy com writeable=False, e o DataFrame
+    é só uma view sobre eles (copy=False). Leituras nas páginas não copiam
+    nem desserializam nada; qualquer escrita acidental cai no copy-on-write
+    do pandas e nunca altera o array do cache. Exige pandas >= 3 (CoW sempre
+    ligado): no 2.x a mesma escrita levanta "assignment destination is read-only".
+    attrs: codigo e versao (identificam o conteúdo para memoização).
+    """
+    datas   = np.ascontiguousarray(df["data"].to_numpy("datetime64[ns]").view("int64"))
+    valores = np.ascontiguousarray(df["valor"].to_numpy("float64"))
+    if np.shares_memory(datas, df["data"].to_numpy()) or np.shares_memory(valores, df["valor"].to_numpy()):
+        datas, valores = datas.copy(), valores.copy()
+    datas.flags.writeable   = False
+    valores.flags.writeable = False
+    out = pd.DataFrame({"data": datas.view("datetime64[ns]"), "valor": valores}, copy=False)
+    out.attrs = {**df.attrs, "codigo": codigo, "versao": next(_VERSOES)}
+    return out
+
 def _last_nonzero(values: list) -> float | None:
     """Último valor não-None e não-zero numa lista de candles."""
     for v in reversed(values):
@@ -76,25 +139,190 @@ def _last_nonzero(values: list) -> float | None:
             return float(v)
     return None
 
+# ─── CACHE STALE-WHILE-REVALIDATE ────────────────────────────────────────────
+class FalhaUpstream(RuntimeError):
+    """
+    Builder com store local não conseguiu falar com o upstream. `dados` é o que
+    já está gravado (já congelado): o SWR mantém a entrada antiga com
+    stale_since ou, sem entrada, serve `dados` já marcados como stale.
+    """
+    def __init__(self, msg: str, dados=None):
+        super().__init__(msg)
+        self.dados = dados
+
+@st.cache_resource(show_spinner=False)
+def _swr_registry() -> dict:
+    """Estado do cache SWR — um por processo, compartilhado por todas as sessões."""
+    return {"lock": threading.Lock(), "entradas": {}, "locks_chave": {}, "builders": {}}
+
+def _vazio(valor) -> bool:
+    """Resultado que não substitui o último dado bom (falha silenciosa do upstream)."""
+    if valor is None:
+        return True
+    if isinstance(valor, pd.DataFrame):
+        return valor.empty
+    return not any(valor.values()) if isinstance(valor, dict) else not valor
+
+def _nova_entrada(valor) -> dict:
+    agora = time.time()
+    return {"valor": valor, "ts": agora, "obtido": datetime.now(), "tentativa": agora,
+            "falhou": False, "atualizando": False}
+
+def _entrada_stale(valor) -> dict:
+    """Entrada sem refresh bem-sucedido (só o store local): já expirada e marcada como falha."""
+    ent = _nova_entrada(valor)
+    ent["ts"], ent["falhou"] = 0.0, True
+    return ent
+
+def _mesmo_conteudo(antigo, novo) -> bool:
+    """Refresh que não trouxe nada novo — mantém o frame antigo e sua versao (memo/figuras)."""
+    return (isinstance(antigo, pd.DataFrame) and isinstance(novo, pd.DataFrame)
+            and antigo.shape == novo.shape and antigo.equals(novo))
+
+def _entregar(ent: dict, ttl: int):
+    """
+    Último dado bom. DataFrames saem como cópia rasa, com stale_since marcado se
+    a revalidação falhou; dicts saem como cópia rasa.
+    """
+    valor = ent["valor"]
+    if not isinstance(valor, pd.DataFrame):
+        return dict(valor) if isinstance(valor, dict) else valor
+    df = valor.copy(deep=False)
+    df.attrs = dict(valor.attrs)
+    if ent["falhou"] and (time.time() - ent["ts"]) >= ttl:
+        df.attrs["stale_since"] = ent["obtido"]
+    return df
+
+def _rebuild(chave: tuple, builder, ent: dict | None) -> None:
+    """Executa o builder e troca a entrada; em falha mantém o dado antigo."""
+    reg     = _swr_registry()
+    reserva = None
+    try:
+        valor = builder()
+    except Exception as e:
+        logger.warning("SWR %s: refresh falhou: %s", chave, e)
+        valor   = None
+        reserva = e.dados if isinstance(e, FalhaUpstream) else None
+    with reg["lock"]:
+        if not _vazio(valor):
+            if ent is not None and _mesmo_conteudo(ent["valor"], valor):
+                valor = ent["valor"]
+            reg["entradas"][chave] = _nova_entrada(valor)
+        elif ent is not None:
+            ent["falhou"] = True
+        elif not _vazio(reserva):
+            reg["entradas"][chave] = _entrada_stale(reserva)
+        if ent is not None:
+            ent["atualizando"] = False
+
+def _reservar(ent: dict) -> bool:
+    """Marca a entrada como em refresh; False se já há um em curso ou recente."""
+    with _swr_registry()["lock"]:
+        if ent["atualizando"] or (time.time() - ent["tentativa"]) < SWR_RETRY:
+            return False
+        ent["atualizando"] = True
+        ent["tentativa"]   = time.time()
+        return True
+
+def _revalidar(chave: tuple, builder, ent: dict) -> None:
+    """Dispara (no máximo um) refresh em background para a chave."""
+    if _reservar(ent):
+        threading.Thread(target=_rebuild, args=(chave, builder, ent),
+                         daemon=True, name=f"swr-{chave[0]}").start()
+
+def recarregar(*alvos) -> None:
+    """
+    Botões "↺ Tentar novamente": refaz agora, de forma síncrona, as entradas
+    SWR cuja última revalidação falhou, sem esperar SWR_RETRY. `alvos` são
+    chaves completas (("sgs", 433)) ou só o tipo ("sgs", "yf_hist", "sidra");
+    sem alvos, todas. "cotacoes" acorda o poller para uma rodada imediata.
+    Chave sem entrada não precisa de nada: a próxima leitura já é síncrona.
+    """
+    reg = _swr_registry()
+    with reg["lock"]:
+        fila = [(chave, ent) for chave, ent in reg["entradas"].items()
+                if ent["falhou"] and not ent["atualizando"] and chave in reg["builders"]
+                and (not alvos or chave in alvos or chave[0] in alvos)]
+        for _, ent in fila:
+            ent["atualizando"] = True
+            ent["tentativa"]   = time.time()
+    for chave, ent in fila:
+        _rebuild(chave, reg["builders"][chave], ent)
+    if not alvos or "cotacoes" in alvos:
+        _poller_cotacoes()["acordar"].set()
+
+def _build_with_fallback(chave: tuple, builder, ttl: int):
+    """
+    Cache stale-while-revalidate para resultados de upstream (DataFrame ou dict).
+
+    - Dentro do TTL: devolve o último dado bom, sem rede.
+    - Após o TTL: devolve o mesmo dado imediatamente e agenda um refresh em
+      background — nenhuma thread de request espera pelo upstream.
+    - Refresh falhou (exceção ou resultado vazio): o dado antigo é mantido e sai
+      com df.attrs['stale_since'] = momento em que foi obtido (lido por
+      components.stale_banner). Nova tentativa no máximo a cada SWR_RETRY s.
+    - Só a primeira carga de cada chave é síncrona; resultado vazio não é guardado.
+      Se ela falhar com FalhaUpstream, o que o store tinha sai já como stale.
+    """
+    reg = _swr_registry()
+    reg["builders"].setdefault(chave, builder)
+    ent = reg["entradas"].get(chave)
+    if ent is None:
+        with reg["lock"]:
+            lock_chave = reg["locks_chave"].setdefault(chave, threading.Lock())
+        with lock_chave:
+            ent = reg["entradas"].get(chave)
+            if ent is None:
+                try:
+                    valor = builder()
+                except FalhaUpstream as e:
+                    logger.warning("SWR %s: carga inicial sem upstream: %s", chave, e)
+                    if _vazio(e.dados):
+                        return pd.DataFrame()
+                    ent = _entrada_stale(e.dados)
+                    with reg["lock"]:
+                        reg["entradas"][chave] = ent
+                    return _entregar(ent, ttl)
+                if _vazio(valor):
+                    return valor
+                ent = _nova_entrada(valor)
+                with reg["lock"]:
+                    reg["entradas"][chave] = ent
+                return _entregar(ent, ttl)
+    if (time.time() - ent["ts"]) >= ttl:
+        _revalidar(chave, builder, ent)
+    return _entregar(ent, ttl)
+
 # ─── BCB/SGS ─────────────────────────────────────────────────────────────────
-def _bcb_fetch(url: str) -> list:
-    for attempt in range(3):
+# Teto de conexões simultâneas ao api.bcb.gov.br, compartilhado por todo o processo
+_BCB_SLOTS = threading.BoundedSemaphore(BCB_MAX_CONEXOES)
+
+def _bcb_fetch(url: str) -> list | None:
+    # Timeout, queda de conexão, 429 e 5xx já são retentados pelo adapter de
+    # net.py; aqui só resta o caso "200 com corpo inválido" (página HTML de
+    # manutenção do BCB ou lista vazia transitória). A página de manutenção
+    # conta como estrangulamento: corta a taxa do host e o reenvio espera o bucket.
+    # Com o BCB fora do ar o circuito do host abre (net.py): session.get levanta
+    # CircuitoAberto na hora e o SWR segue entregando a última série boa.
+    # None = upstream falhou; [] = respondeu, mas sem linhas
+    session = session_for(url)
+    data    = None
+    for _ in range(3):
         try:
-            r = requests.get(url, headers=HEADERS, timeout=20, verify=False)
+            with _BCB_SLOTS:
+                r = session.get(url, headers=HEADERS, timeout=20)
             if r.status_code != 200:
-                time.sleep(1); continue
+                return None
             if "html" in r.headers.get("Content-Type", "").lower():
-                time.sleep(1); continue
+                limitador(url).estrangulado()
+                data = None
+                continue
             data = r.json()
             if isinstance(data, list) and len(data) > 0:
                 return data
-            time.sleep(0.5)
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
-            if attempt < 2:
-                time.sleep(1)
         except Exception:
-            break
-    return []
+            return None
+    return [] if isinstance(data, list) else None
 
 @st.cache_data(ttl=3600, show_spinner=False)
 def get_bcb(codigo: int, ultimos: int) -> pd.DataFrame:
@@ -107,9 +335,56 @@ def get_bcb(codigo: int, ultimos: int) -> pd.DataFrame:
         raw  = _bcb_fetch(BCB_BASE.format(codigo=codigo) + f"?formato=json&dataInicial={ini}&dataFinal={fim}")
     return _build_df(raw)
 
-@st.cache_data(ttl=3600, show_spinner=False)
+def _merge_incremental(antigo: pd.DataFrame, novo: pd.DataFrame) -> pd.DataFrame:
+    """Une série armazenada + trecho novo; em datas repetidas vale o dado novo."""
+    if novo.empty:
+        return antigo
+    df = pd.concat([antigo[antigo["data"] < novo["data"].min()], novo], ignore_index=True)
+    return df.drop_duplicates(subset="data", keep="last").sort_values("data").reset_index(drop=True)
+
+def _fetch_bcb_full(codigo: int) -> pd.DataFrame:
+    """
+    Série completa do SGS, persistida em disco (store.py).
+    Primeira chamada: backfill do histórico inteiro. Depois, cada refresh só pede
+    dataInicial = último dado gravado − SGS_RELEITURA_DIAS (captura revisões)
+    e faz upsert — milissegundos em vez do download completo, e um restart
+    já começa com a série em disco.
+    """
+    base     = BCB_BASE.format(codigo=codigo)
+    gravado  = store.load_sgs(codigo)
+    if gravado.empty:
+        df = _build_df(_bcb_fetch(base + "?formato=json"))
+        store.save_sgs(codigo, df)
+        return _congelar(df, int(codigo)) if not df.empty else df
+    ini  = (gravado["data"].iloc[-1] - timedelta(days=SGS_RELEITURA_DIAS)).strftime("%d/%m/%Y")
+    fim  = datetime.today().strftime("%d/%m/%Y")
+    raw  = _bcb_fetch(base + f"?formato=json&dataInicial={ini}&dataFinal={fim}")
+    if raw is None:
+        raise FalhaUpstream(f"SGS {codigo} indisponível", _congelar(gravado, int(codigo)))
+    novo = _build_df(raw)
+    store.save_sgs(codigo, novo)
+    return _congelar(_merge_incremental(gravado, novo), int(codigo))
+
+def _spec_bcb_full(codigo: int) -> tuple:
+    return ("sgs", int(codigo)), lambda: _fetch_bcb_full(codigo), TTL_BCB
+
 def get_bcb_full(codigo: int) -> pd.DataFrame:
-    return _build_df(_bcb_fetch(BCB_BASE.format(codigo=codigo) + "?formato=json"))
+    """Série completa do SGS via cache SWR (TTL_BCB) sobre o store local."""
+    return _build_with_fallback(*_spec_bcb_full(codigo))
+
+def get_bcb_many(codigos) -> dict:
+    """
+    Várias séries SGS em paralelo — retorna {codigo: DataFrame}.
+    Cada série passa por get_bcb_full (mesma entrada de cache das chamadas
+    individuais); o pool respeita BCB_MAX_CONEXOES. Com cache frio, a latência
+    da página fica próxima à da série mais lenta, não à soma de todas.
+    """
+    codigos = list(dict.fromkeys(int(c) for c in codigos))
+    if len(codigos) <= 1:
+        return {c: get_bcb_full(c) for c in codigos}
+    with ThreadPoolExecutor(max_workers=min(len(codigos), BCB_MAX_CONEXOES),
+                            thread_name_prefix="bcb") as pool:
+        return dict(zip(codigos, pool.map(get_bcb_full, codigos)))
 
 @st.cache_data(ttl=3600, show_spinner=False)
 def get_bcb_range(codigo: int, ini: str, fim: str) -> pd.DataFrame:
@@ -117,162 +392,526 @@ def get_bcb_range(codigo: int, ini: str, fim: str) -> pd.DataFrame:
         BCB_BASE.format(codigo=codigo) + f"?formato=json&dataInicial={ini}&dataFinal={fim}"))
 
 # ─── BCB/FOCUS ───────────────────────────────────────────────────────────────
-def _focus_fetch(url: str, params: dict) -> list:
-    resultados = []
-    params = {**params, "$format": "json", "$top": 10000, "$skip": 0}
-    for _ in range(10):
-        try:
-            r = requests.get(url, params=params, headers=HEADERS, timeout=20)
-            if r.status_code != 200:
-                break
-            data = r.json().get("value", [])
-            if not data:
-                break
-            resultados.extend(data)
-            if len(data) < params["$top"]:
-                break
-            params["$skip"] += params["$top"]
-        except Exception:
-            break
+def _focus_pagina(session, url: str, params: dict, skip: int) -> dict | None:
+    try:
+        r = session.get(url, params={**params, "$skip": skip}, headers=HEADERS, timeout=30)
+        if r.status_code != 200:
+            return None
+        return r.json()
+    except Exception:
+        return None
+
+def _focus_fetch(url: str, params: dict) -> list | None:
+    """
+    Cliente OData do Olinda. A 1ª página vem com $count=true; sabendo o total,
+    as demais ($skip) saem em paralelo (FOCUS_MAX_CONEXOES) em vez de uma
+    após a outra. Sem @odata.count, cai na paginação sequencial.
+    Retorna None se alguma página falhar — o chamador não grava janela parcial.
+    """
+    session = session_for(url)
+    params  = {**params, "$format": "json", "$top": FOCUS_PAGINA, "$count": "true"}
+    pagina  = _focus_pagina(session, url, params, 0)
+    if pagina is None:
+        return None
+    resultados = list(pagina.get("value", []))
+    total      = pagina.get("@odata.count")
+    if total is None:
+        skip = FOCUS_PAGINA
+        while len(pagina.get("value", [])) == FOCUS_PAGINA:
+            pagina = _focus_pagina(session, url, params, skip)
+            if pagina is None:
+                return None
+            resultados.extend(pagina.get("value", []))
+            skip += FOCUS_PAGINA
+        return resultados
+    skips = list(range(FOCUS_PAGINA, int(total), FOCUS_PAGINA))
+    if skips:
+        with ThreadPoolExecutor(max_workers=min(len(skips), FOCUS_MAX_CONEXOES),
+                                thread_name_prefix="focus") as pool:
+            paginas = list(pool.map(lambda sk: _focus_pagina(session, url, params, sk), skips))
+        if any(p is None for p in paginas):
+            return None
+        for p in paginas:
+            resultados.extend(p.get("value", []))
     return resultados
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def get_focus_anual(indicador: str, anos: int = 5) -> pd.DataFrame:
-    data_ini = (datetime.today() - timedelta(days=anos * 365)).strftime("%Y-%m-%d")
-    params = {
-        "$filter": f"Indicador eq '{indicador}' and baseCalculo eq '0' and Data ge '{data_ini}'",
-        "$select": "Data,DataReferencia,Mediana,Minimo,Maximo,DesvioPadrao",
-        "$orderby": "Data asc",
-    }
-    raw = _focus_fetch(FOCUS_ANUAL, params)
-    if not raw:
-        return pd.DataFrame()
-    df = pd.DataFrame(raw).rename(columns={
-        "Data": "data", "DataReferencia": "ano_ref",
-        "Mediana": "mediana", "Minimo": "minimo",
-        "Maximo": "maximo", "DesvioPadrao": "desvio",
+def _focus_para_store(raw: list, ref: str) -> pd.DataFrame:
+    df = pd.DataFrame(raw)
+    if df.empty:
+        return pd.DataFrame(columns=["indicador", "data", "ref", "mediana", "minimo", "maximo", "desvio"])
+    df = df.rename(columns={
+        "Indicador": "indicador", "Data": "data", ref: "ref", "Mediana": "mediana",
+        "Minimo": "minimo", "Maximo": "maximo", "DesvioPadrao": "desvio",
     })
-    df["data"]    = pd.to_datetime(df["data"], errors="coerce")
-    df["ano_ref"] = pd.to_numeric(df["ano_ref"], errors="coerce")
+    df["data"] = df["data"].astype(str).str[:10]
+    df["ref"]  = df["ref"].astype(str)
     for col in ["mediana", "minimo", "maximo", "desvio"]:
         df[col] = pd.to_numeric(df[col], errors="coerce")
-    return df.dropna(subset=["data", "mediana"]).sort_values("data").reset_index(drop=True)
+    return df[["indicador", "data", "ref", "mediana", "minimo", "maximo", "desvio"]]
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def get_focus_12m(indicador: str, anos: int = 3) -> pd.DataFrame:
-    data_ini = (datetime.today() - timedelta(days=anos * 365)).strftime("%Y-%m-%d")
-    params = {
-        "$filter": f"Indicador eq '{indicador}' and baseCalculo eq '0' and Data ge '{data_ini}'",
-        "$select": "Data,Mediana,Minimo,Maximo,DesvioPadrao",
-        "$orderby": "Data asc",
+def _focus_sync(serie: str, url: str, ref: str, indicadores: list, anos: int) -> tuple:
+    """
+    Janela de `anos` do Focus para todos os `indicadores`, via store local.
+    Um único download por endpoint: o filtro OData junta os indicadores
+    ("Indicador eq 'A' or Indicador eq 'B' ..."), páginas em paralelo.
+    Primeira carga baixa a janela inteira; janela maior pedida depois só baixa
+    o trecho anterior à cobertura; refresh só pede Data gt '<última data>'.
+    Retorna (frame do store, falhou) — falhou se algum download não veio.
+    """
+    data_ini   = (datetime.today() - timedelta(days=anos * 365)).strftime("%Y-%m-%d")
+    desde, ult = store.focus_estado(serie, indicadores)
+    base = {
+        "$select": f"Indicador,Data,{ref},Mediana,Minimo,Maximo,DesvioPadrao",
+        "$orderby": f"Indicador asc,Data asc,{ref} asc",   # ordem total: páginas paralelas não se sobrepõem
     }
-    raw = _focus_fetch(FOCUS_12M, params)
-    if not raw:
-        return get_focus_anual(indicador, anos=anos)
-    df = pd.DataFrame(raw).rename(columns={
-        "Data": "data", "Mediana": "mediana",
-        "Minimo": "minimo", "Maximo": "maximo", "DesvioPadrao": "desvio",
-    })
-    df["data"] = pd.to_datetime(df["data"], errors="coerce")
-    for col in ["mediana", "minimo", "maximo", "desvio"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-    return df.dropna(subset=["data", "mediana"]).sort_values("data").reset_index(drop=True)
+    filtro = "(" + " or ".join(f"Indicador eq '{ind}'" for ind in indicadores) + ") and baseCalculo eq '0'"
+    falhou = False
+    if desde is None or data_ini < desde:
+        janela = f" and Data ge '{data_ini}'" + (f" and Data lt '{desde}'" if desde else "")
+        raw = _focus_fetch(url, {**base, "$filter": filtro + janela})
+        if raw is not None:
+            store.save_focus(serie, _focus_para_store(raw, ref), indicadores, desde=data_ini)
+            desde = data_ini
+        else:
+            falhou = True
+    if ult is not None:
+        raw = _focus_fetch(url, {**base, "$filter": filtro + f" and Data gt '{ult}'"})
+        if raw:
+            store.save_focus(serie, _focus_para_store(raw, ref))
+        elif raw is None:
+            falhou = True
+    if desde is None:
+        return pd.DataFrame(), falhou
+    return store.load_focus(serie, indicadores, data_ini).dropna(subset=["data", "mediana"]), falhou
+
+def _indexar_focus(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Frame de todos os indicadores, ordenado por indicador, com
+    attrs['fatias'] = {indicador: (ini, fim)} — cada consulta vira um iloc.
+    """
+    df = df.reset_index(drop=True)
+    ind    = df["indicador"]
+    inicio = ind.ne(ind.shift()).to_numpy().nonzero()[0].tolist()
+    df.attrs["fatias"] = {ind.iat[a]: (a, b) for a, b in zip(inicio, inicio[1:] + [len(df)])}
+    return df
+
+def _fatia_focus(bulk: pd.DataFrame, indicador: str, colunas: list) -> pd.DataFrame:
+    """Linhas de um indicador do frame em massa; herda stale_since."""
+    if bulk.empty:
+        return pd.DataFrame()
+    ini, fim = bulk.attrs.get("fatias", {}).get(indicador, (0, 0))
+    df = bulk.iloc[ini:fim][colunas].reset_index(drop=True)
+    df.attrs = {k: v for k, v in bulk.attrs.items() if k != "fatias"}
+    return df
+
+def _fetch_focus_anual(anos: int) -> pd.DataFrame:
+    df, falhou = _focus_sync("anual", FOCUS_ANUAL, "DataReferencia", FOCUS_INDICADORES, anos)
+    if not df.empty:
+        df = df.rename(columns={"ref": "ano_ref"})
+        df["ano_ref"] = pd.to_numeric(df["ano_ref"], errors="coerce")
+        df = _indexar_focus(df)
+    if falhou:
+        raise FalhaUpstream("Focus anual indisponível", df)
+    return df
+
+def _spec_focus_anual(anos: int) -> tuple:
+    return ("focus_anual", anos), lambda: _fetch_focus_anual(anos), TTL_FOCUS
+
+def get_focus_anual(indicador: str, anos: int = 5) -> pd.DataFrame:
+    """Fatia de um indicador do download em massa das expectativas anuais."""
+    return _fatia_focus(_build_with_fallback(*_spec_focus_anual(anos)), indicador,
+                        ["data", "ano_ref", "mediana", "minimo", "maximo", "desvio"])
+
+def _fetch_focus_12m(anos: int) -> pd.DataFrame:
+    df, falhou = _focus_sync("12m", FOCUS_12M, "Suavizada", sorted(FOCUS_INDICADORES_12M), anos)
+    df = _indexar_focus(df) if not df.empty else pd.DataFrame()
+    if falhou:
+        raise FalhaUpstream("Focus 12 meses indisponível", df)
+    return df
+
+def _spec_focus_12m(anos: int) -> tuple:
+    return ("focus_12m", anos), lambda: _fetch_focus_12m(anos), TTL_FOCUS
+
+def get_focus_12m(indicador: str, anos: int = 3) -> pd.DataFrame:
+    """Fatia da série 12 meses; sem ela, cai nas expectativas anuais."""
+    df = _fatia_focus(_build_with_fallback(*_spec_focus_12m(anos)), indicador,
+                      ["data", "mediana", "minimo", "maximo", "desvio"])
+    return df if not df.empty else get_focus_anual(indicador, anos)
 
 # ─── IBGE/SIDRA ──────────────────────────────────────────────────────────────
 _SIDRA_GRUPOS = "7169,7170,7445,7486,7625,7626,7627,7628,7629"
 
-def _sidra_fetch(tabela: int, variavel: int, periodos: int) -> pd.DataFrame:
+# Variáveis da tabela 7060 baixadas juntas → coluna no frame largo
+_SIDRA_VARIAVEIS = {"63": "mensal", "2265": "acum12m"}
+
+def _sidra_longo(raw: list) -> pd.DataFrame:
+    """
+    Resposta SIDRA → colunas [variavel, periodo, grupo_id, grupo, valor] (strings).
+    Aceita o formato aninhado do /agregados (variável → resultados → séries)
+    e o formato plano (D1C..D5C); no plano, as colunas de período, variável e
+    grupo são achadas pelo conteúdo, não pela posição.
+    """
+    if raw and "resultados" in raw[0]:
+        linhas = [
+            (str(var.get("id")), periodo, cat_id, cat_nome, valor)
+            for var in raw
+            for res in var.get("resultados", [])
+            for cla in res.get("classificacoes", [])[:1]
+            for cat_id, cat_nome in cla.get("categoria", {}).items()
+            for ser in res.get("series", [])
+            for periodo, valor in (ser.get("serie") or {}).items()
+        ]
+        return pd.DataFrame(linhas, columns=["variavel", "periodo", "grupo_id", "grupo", "valor"])
+    df = pd.DataFrame(raw).astype(str)
+    if "V" not in df.columns:
+        return pd.DataFrame()
+    grupos = set(_SIDRA_GRUPOS.split(","))
+    col    = {}
+    for c in (f"D{k}C" for k in range(1, 6)):
+        if c not in df.columns:
+            continue
+        v = df[c].iloc[1:] if len(df) > 1 else df[c]   # 1ª linha pode ser cabeçalho
+        if v.isin(_SIDRA_VARIAVEIS.keys()).all():
+            col.setdefault("variavel", c)
+        elif v.isin(grupos).all():
+            col.setdefault("grupo_id", c)
+        elif v.str.fullmatch(r"\d{6}").all():
+            col.setdefault("periodo", c)
+    if not {"periodo", "grupo_id"} <= col.keys():
+        return pd.DataFrame()
+    out = pd.DataFrame({
+        "variavel": df[col["variavel"]] if "variavel" in col else next(iter(_SIDRA_VARIAVEIS)),
+        "periodo":  df[col["periodo"]],
+        "grupo_id": df[col["grupo_id"]],
+        "grupo":    df.get(col["grupo_id"][:-1] + "N", df[col["grupo_id"]]),
+        "valor":    df["V"],
+    })
+    return out[df[col["periodo"]].str.fullmatch(r"\d{6}")]
+
+def _sidra_fetch(tabela: int, periodos: int) -> pd.DataFrame:
+    """
+    IPCA por grupo — variação mensal (63) e acumulada em 12 meses (2265) num
+    único request. Parse vetorizado: um to_datetime/to_numeric por coluna.
+    Retorna frame largo indexado por (data, grupo_id): colunas grupo, mensal, acum12m.
+    """
     url = (
-        f"{SIDRA_BASE}/{tabela}/periodos/-{periodos}/variaveis/{variavel}"
+        f"{SIDRA_BASE}/{tabela}/periodos/-{periodos}/variaveis/{'|'.join(_SIDRA_VARIAVEIS)}"
         f"?localidades=N1[all]&classificacao=315[{_SIDRA_GRUPOS}]"
     )
     raw = None
-    for attempt in range(3):
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=30)
-            if r.status_code == 200:
-                raw = r.json(); break
-            time.sleep(1)
-        except Exception:
-            time.sleep(1)
-    if not raw:
+    try:
+        # retries com backoff ficam no adapter da sessão compartilhada
+        r = session_for(url).get(url, headers=HEADERS, timeout=30)
+        if r.status_code == 200:
+            raw = r.json()
+    except Exception:
+        pass
+    if not raw or not isinstance(raw, list):
         return pd.DataFrame()
-    rows = []
-    for bloco in raw:
-        periodo_str = str(bloco.get("D3C") or bloco.get("D2C", ""))
-        grupo_id    = str(bloco.get("D4C") or bloco.get("D5C", ""))
-        grupo_nome  = str(bloco.get("D4N") or bloco.get("D5N", grupo_id))
-        valor_str   = str(bloco.get("V", "")).strip()
-        if not periodo_str or valor_str in ("...", "-", "", "X"):
-            continue
-        try:
-            dt    = pd.to_datetime(periodo_str, format="%Y%m")
-            valor = float(valor_str.replace(",", "."))
-        except Exception:
-            continue
-        rows.append({"data": dt, "grupo_id": grupo_id, "grupo": grupo_nome, "valor": valor})
-    if not rows:
+    df = _sidra_longo(raw)
+    if df.empty:
+        return pd.DataFrame()
+    df["data"]  = pd.to_datetime(df["periodo"], format="%Y%m", errors="coerce")
+    df["valor"] = pd.to_numeric(df["valor"].str.strip().str.replace(",", ".", regex=False),
+                                errors="coerce")        # "...", "-", "X" → NaN
+    df = df.dropna(subset=["data", "valor"])
+    if df.empty:
         return pd.DataFrame()
-    return pd.DataFrame(rows).sort_values(["data", "grupo_id"]).reset_index(drop=True)
+    largo = (df.set_index(["data", "grupo_id", "variavel"])["valor"]
+               .unstack("variavel")
+               .rename(columns=_SIDRA_VARIAVEIS))
+    largo = largo[[c for c in _SIDRA_VARIAVEIS.values() if c in largo.columns]]
+    largo.columns.name = None
+    nomes = df.drop_duplicates(["data", "grupo_id"]).set_index(["data", "grupo_id"])["grupo"]
+    largo.insert(0, "grupo", nomes)
+    return largo.sort_index()
+
+def _spec_sidra(meses: int) -> tuple:
+    return ("sidra", 7060, meses), lambda: _sidra_fetch(tabela=7060, periodos=meses), TTL_IBGE
+
+def _sidra_variavel(largo: pd.DataFrame, coluna: str) -> pd.DataFrame:
+    """Uma variável do frame largo no formato longo [data, grupo_id, grupo, valor]."""
+    if largo.empty or coluna not in largo.columns:
+        return pd.DataFrame()
+    df = largo[["grupo", coluna]].dropna(subset=[coluna]).reset_index()
+    df = df.rename(columns={coluna: "valor"})[["data", "grupo_id", "grupo", "valor"]]
+    df.attrs = dict(largo.attrs)
+    return df
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def get_ipca_grupos(meses: int = 60) -> pd.DataFrame:
-    return _sidra_fetch(tabela=7060, variavel=63, periodos=meses)
+    return _sidra_variavel(_build_with_fallback(*_spec_sidra(meses)), "mensal")
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def get_ipca_acum_grupo(meses: int = 60) -> pd.DataFrame:
-    return _sidra_fetch(tabela=7060, variavel=2265, periodos=meses)
+    return _sidra_variavel(_build_with_fallback(*_spec_sidra(meses)), "acum12m")
 
 # ─── TRANSFORMAÇÕES ──────────────────────────────────────────────────────────
-def aplicar_periodo(df: pd.DataFrame, periodo: str, ind_nome: str) -> tuple:
-    df = df.copy().sort_values("data").reset_index(drop=True)
-    originais = {"Original", "Mensal (original)", "Var. trimestral (original)", "Nível (original)"}
-    if periodo in originais:
+_ORIGINAIS = {"Original", "Mensal (original)", "Var. trimestral (original)", "Nível (original)"}
+
+# periodo → (tipo, janela, unidade); "soma" = rolling sum, "var" = pct_change,
+# "ano" = soma acumulada dentro do ano-calendário
+_TRANSF = {
+    "Acumulado 12M":          ("soma", 12, "% acum. 12M"),
+    "Acumulado 4 trimestres": ("soma", 4,  "% acum. 4 tri"),
+    "Var. mensal (m/m)":      ("var",  1,  "% m/m"),
+    "Var. trimestral (t/t)":  ("var",  3,  "% t/t"),
+    "Var. anual (a/a)":       ("var",  12, "% a/a"),
+    "Acumulado no ano":       ("ano",  0,  "% acum. ano"),
+}
+
+def _transformar(df: pd.DataFrame, periodo: str) -> tuple:
+    """Cálculo puro de aplicar_periodo, sobre qualquer trecho contíguo da série."""
+    if periodo in _ORIGINAIS:
         return df, df.attrs.get("unit", "")
-    elif periodo == "Acumulado 12M":
-        df["valor"] = df["valor"].rolling(12).sum()
-        return df.dropna(), "% acum. 12M"
-    elif periodo == "Acumulado no ano":
-        df["valor"] = df.groupby(df["data"].dt.year)["valor"].cumsum()
-        return df, "% acum. ano"
-    elif periodo == "Var. mensal (m/m)":
-        df["valor"] = df["valor"].pct_change(1) * 100
-        return df.dropna(), "% m/m"
-    elif periodo == "Var. trimestral (t/t)":
-        df["valor"] = df["valor"].pct_change(3) * 100
-        return df.dropna(), "% t/t"
-    elif periodo == "Var. anual (a/a)":
-        df["valor"] = df["valor"].pct_change(12) * 100
-        return df.dropna(), "% a/a"
-    elif periodo == "Acumulado 4 trimestres":
-        df["valor"] = df["valor"].rolling(4).sum()
-        return df.dropna(), "% acum. 4 tri"
-    return df, ""
+    if periodo not in _TRANSF:
+        return df, ""
+    tipo, n, unit = _TRANSF[periodo]
+    v = df["valor"]
+    if tipo == "ano":
+        return df.assign(valor=v.groupby(df["data"].dt.year).cumsum()), unit
+    novo = v.rolling(n).sum() if tipo == "soma" else v.pct_change(n) * 100
+    return df.assign(valor=novo).dropna(), unit
+
+# Linhas anteriores necessárias para recalcular a partir da posição k
+_JANELA_TRANSF = {p: (n - 1 if tipo == "soma" else n) for p, (tipo, n, _) in _TRANSF.items()}
+
+def _inicio_recalculo(df: pd.DataFrame, periodo: str, k: int) -> int:
+    """Primeira linha da fonte que influencia o resultado a partir de k."""
+    if periodo == "Acumulado no ano":
+        ano = df["data"].iat[k].year
+        return int(df["data"].searchsorted(pd.Timestamp(year=ano, month=1, day=1)))
+    return max(0, k - _JANELA_TRANSF.get(periodo, 0))
+
+_TRANSF_MAX = 256   # entradas na tabela de transformações (janelas de export criam chaves novas)
+
+@st.cache_resource(show_spinner=False)
+def _transformacoes() -> dict:
+    """
+    Tabela de transformações compartilhada pelo processo:
+    (codigo, periodo, 1ª data) → {versao, fonte, resultado, unit}.
+    """
+    return {"lock": threading.Lock(), "tabela": {}}
+
+def aplicar_periodo(df: pd.DataFrame, periodo: str, ind_nome: str) -> tuple:
+    """
+    Transformação de período sobre [data, valor]. Não copia a entrada: séries
+    do cache já chegam ordenadas e imutáveis (_congelar); o resultado é um
+    frame novo via assign, e "original" devolve a própria view.
+
+    Séries com attrs codigo/versao são memoizadas por (codigo, periodo, versao):
+    rerun sem dado novo não recalcula nada. Se a versão mudou, só o trecho a
+    partir da primeira linha divergente (mais a janela da transformação) é
+    recalculado e emendado no resultado anterior.
+    """
+    # a emenda mistura posição k com rótulos do índice: exige 0..n-1
+    posicional = isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1
+    if not df["data"].is_monotonic_increasing or not posicional:
+        df = df.sort_values("data").reset_index(drop=True)
+    codigo, versao = df.attrs.get("codigo"), df.attrs.get("versao")
+    if periodo in _ORIGINAIS or codigo is None or versao is None or df.empty:
+        return _transformar(df, periodo)
+
+    memo  = _transformacoes()
+    chave = (codigo, periodo, df["data"].iat[0])
+    ent   = memo["tabela"].get(chave)
+    if ent is not None and ent["versao"] == versao and len(ent["fonte"]) == len(df):
+        res, unit = ent["resultado"], ent["unit"]
+    else:
+        k = 0
+        if ent is not None and len(ent["fonte"]) <= len(df):
+            antiga, n = ent["fonte"], len(ent["fonte"])
+            difere = np.flatnonzero(
+                (antiga["data"].to_numpy() != df["data"].to_numpy()[:n])
+                | (antiga["valor"].to_numpy() != df["valor"].to_numpy()[:n]))
+            k = int(difere[0]) if len(difere) else n
+        if k == 0:
+            res, unit = _transformar(df, periodo)
+        else:
+            ini         = _inicio_recalculo(df, periodo, k) if k < len(df) else k
+            cauda, unit = _transformar(df.iloc[ini:], periodo)
+            anterior    = ent["resultado"]
+            res = pd.concat([anterior[anterior.index < k], cauda[cauda.index >= k]])
+        with memo["lock"]:
+            memo["tabela"].pop(chave, None)
+            memo["tabela"][chave] = {"versao": versao, "fonte": df, "resultado": res, "unit": unit}
+            while len(memo["tabela"]) > _TRANSF_MAX:
+                memo["tabela"].pop(next(iter(memo["tabela"])))
+    res = res.copy(deep=False)
+    res.attrs = {**df.attrs, "transformacao": periodo}
+    return res, unit
+
+# ─── MATRIZ DE SÉRIES ────────────────────────────────────────────────────────
+def alinhar_series(series: dict) -> pd.DataFrame:
+    """
+    {nome: df [data, valor]} → matriz larga: índice = união ordenada das datas,
+    uma coluna float64 por série (NaN onde a série não tem observação).
+    Séries vazias ficam de fora. Os valores ficam num único bloco 2-D.
+    """
+    validas = {nome: df for nome, df in series.items() if not df.empty}
+    if not validas:
+        return pd.DataFrame()
+    datas = [df["data"].to_numpy("datetime64[ns]") for df in validas.values()]
+    idx   = np.unique(np.concatenate(datas))
+    m     = np.full((len(idx), len(validas)), np.nan)
+    for j, (d, df) in enumerate(zip(datas, validas.values())):
+        m[np.searchsorted(idx, d), j] = df["valor"].to_numpy("float64")
+    return pd.DataFrame(m, index=pd.DatetimeIndex(idx, name="data"), columns=list(validas))
+
+def _empacotar(m: np.ndarray) -> tuple:
+    """Sobe as observações de cada coluna para o topo, em ordem — a coluna vira a série contígua."""
+    ordem = np.argsort(np.isnan(m), axis=0, kind="stable")
+    return np.take_along_axis(m, ordem, axis=0), ordem
+
+def _desempacotar(p: np.ndarray, ordem: np.ndarray) -> np.ndarray:
+    out = np.empty_like(p)
+    np.put_along_axis(out, ordem, p, axis=0)
+    return out
+
+def transformar_matriz(matriz: pd.DataFrame, periodo: str) -> tuple:
+    """
+    Mesma transformação de aplicar_periodo em todas as colunas numa só passada
+    vetorizada. Cada coluna é tratada sobre as próprias observações (séries de
+    frequências diferentes não se misturam na janela); linhas sem nenhum valor
+    saem. Retorna (matriz, unidade).
+    """
+    if matriz.empty or periodo in _ORIGINAIS or periodo not in _TRANSF:
+        return matriz, ""
+    tipo, n, unit = _TRANSF[periodo]
+    p, ordem = _empacotar(matriz.to_numpy("float64"))
+    r = np.full_like(p, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if tipo == "soma":
+            if len(p) >= n:
+                r[n - 1:] = np.lib.stride_tricks.sliding_window_view(p, n, axis=0).sum(axis=-1)
+        elif tipo == "var":
+            r[n:] = (p[n:] / p[:-n] - 1) * 100
+        else:
+            anos  = np.take_along_axis(
+                np.broadcast_to(matriz.index.year.to_numpy()[:, None], p.shape), ordem, axis=0)
+            acum  = np.cumsum(np.nan_to_num(p), axis=0)
+            linha = np.arange(len(p))[:, None]
+            novo  = np.ones(p.shape, dtype=bool)
+            novo[1:] = anos[1:] != anos[:-1]
+            # soma acumulada até a véspera do início de cada ano, propagada para baixo
+            ini   = np.maximum.accumulate(np.where(novo, linha, 0), axis=0)
+            base  = np.take_along_axis(acum - np.nan_to_num(p), ini, axis=0)
+            r     = np.where(np.isnan(p), np.nan, acum - base)
+    out = pd.DataFrame(_desempacotar(r, ordem), index=matriz.index, columns=matriz.columns)
+    return out.dropna(how="all"), unit
+
+def ultimas_observacoes(matriz: pd.DataFrame) -> pd.DataFrame:
+    """Por coluna: data e valor da última observação e valor da anterior (NaN se não houver)."""
+    p, ordem = _empacotar(matriz.to_numpy("float64"))
+    n    = (~np.isnan(p)).sum(axis=0)
+    cols = np.arange(p.shape[1])
+    ult  = np.maximum(n - 1, 0)
+    ant  = np.maximum(n - 2, 0)
+    return pd.DataFrame({
+        "data":     matriz.index[ordem[ult, cols]].where(n > 0),
+        "valor":    np.where(n > 0, p[ult, cols], np.nan),
+        "anterior": np.where(n > 1, p[ant, cols], np.nan),
+    }, index=matriz.columns)
 
 # ─── YAHOO FINANCE — sessão autenticada com crumb ─────────────────────────────
-def _build_yf_session() -> tuple:
-    s = requests.Session()
-    s.headers.update(HEADERS)
-    try:
-        s.get(_YF_COOKIE_URL, timeout=10)
-    except Exception:
-        pass
-    r = s.get(_YF_CRUMB_URL, timeout=10)
-    if r.status_code != 200 or not r.text.strip():
-        raise RuntimeError(f"Yahoo crumb indisponível (status {r.status_code})")
-    return s, r.text.strip()
+class _YFAuth:
+    """
+    Par cookie+crumb do Yahoo, único por processo e thread-safe.
+
+    Antes ficava em st.session_state: cada visitante refazia o handshake
+    fc.yahoo.com + getcrumb, e o que get_all_quotes (cacheada) usava dependia de
+    quem provocou o cache miss. Agora um handshake serve todo mundo; 401/429
+    invalidam o crumb sob lock e só a primeira thread renova. Com YF_COOKIE_JAR,
+    os cookies vão para disco e um restart tenta o crumb direto. Handshake falho
+    fica lembrado: por YF_CRUMB_ESPERA s, get() levanta sem tocar a rede nem
+    enfileirar threads atrás do lock.
+    """
+    def __init__(self, cookie_jar: str = ""):
+        self._lock    = threading.Lock()
+        self._jar     = cookie_jar
+        self._session = None
+        self._crumb   = None
+        self._ts      = 0.0
+        self._falha   = 0.0
+
+    def get(self) -> tuple:
+        if (time.time() - self._falha) < YF_CRUMB_ESPERA:
+            raise RuntimeError("Yahoo crumb indisponível (aguardando nova tentativa)")
+        with self._lock:
+            if self._session is None or (time.time() - self._ts) >= YF_CRUMB_TTL:
+                if (time.time() - self._falha) < YF_CRUMB_ESPERA:
+                    raise RuntimeError("Yahoo crumb indisponível (aguardando nova tentativa)")
+                try:
+                    self._renovar()
+                except Exception:
+                    self._falha = time.time()
+                    raise
+                self._falha = 0.0
+            return self._session, self._crumb
+
+    def invalidate(self, crumb: str) -> None:
+        """Descarta o crumb após 401/429 — no-op se outra thread já renovou."""
+        with self._lock:
+            if crumb == self._crumb:
+                self._ts = 0.0
+
+    def _renovar(self) -> None:
+        s = nova_sessao()
+        s.headers.update(HEADERS)
+        crumb = self._crumb_de(s) if self._carregar_cookies(s) else None
+        if not crumb:
+            try:
+                s.get(_YF_COOKIE_URL, timeout=10)
+            except Exception:
+                pass
+            crumb = self._crumb_de(s)
+        if not crumb:
+            raise RuntimeError("Yahoo crumb indisponível")
+        self._session, self._crumb, self._ts = s, crumb, time.time()
+        self._salvar_cookies(s)
+
+    @staticmethod
+    def _crumb_de(s: requests.Session) -> str | None:
+        try:
+            r = s.get(_YF_CRUMB_URL, timeout=10)
+        except Exception:
+            return None
+        return r.text.strip() if r.status_code == 200 and r.text.strip() else None
+
+    def _carregar_cookies(self, s: requests.Session) -> bool:
+        if not self._jar or not os.path.exists(self._jar):
+            return False
+        try:
+            jar = LWPCookieJar(self._jar)
+            jar.load(ignore_discard=True)
+        except (OSError, ValueError) as e:
+            logger.warning("Yahoo cookie jar ilegível: %s", e)
+            return False
+        for c in jar:
+            s.cookies.set_cookie(c)
+        return len(s.cookies) > 0
+
+    def _salvar_cookies(self, s: requests.Session) -> None:
+        if not self._jar:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._jar) or ".", exist_ok=True)
+            jar = LWPCookieJar(self._jar)
+            for c in s.cookies:
+                jar.set_cookie(c)
+            jar.save(ignore_discard=True)
+        except OSError as e:
+            logger.warning("Yahoo cookie jar não gravado: %s", e)
+
+@st.cache_resource(show_spinner=False)
+def _yf_auth() -> _YFAuth:
+    return _YFAuth(YF_COOKIE_JAR)
 
 def _get_yf_session() -> tuple:
-    key   = "_yf_session_cache"
-    cache = st.session_state.get(key)
-    if cache and (time.time() - cache["ts"]) < 3000:
-        return cache["session"], cache["crumb"]
-    session, crumb = _build_yf_session()
-    st.session_state[key] = {"session": session, "crumb": crumb, "ts": time.time()}
-    return session, crumb
+    return _yf_auth().get()
 
 def _yf_request(sym: str, params: dict, retries: int = 3) -> dict | None:
-    for attempt in range(retries):
+    # Ritmo e backoff ficam no bucket AIMD do host (net.py): 429 já foi
+    # reenviado e cortou a taxa do processo; aqui só resta trocar o crumb
+    for _ in range(retries):
         try:
             session, crumb = _get_yf_session()
             r = session.get(
@@ -285,11 +924,9 @@ def _yf_request(sym: str, params: dict, retries: int = 3) -> dict | None:
                 if data.get("chart", {}).get("result"):
                     return data
             if r.status_code in (401, 429):
-                st.session_state.pop("_yf_session_cache", None)
-                time.sleep(2 ** attempt + random.uniform(0.5, 1.5))
-                continue
+                _yf_auth().invalidate(crumb)
         except Exception:
-            time.sleep(1)
+            continue
     return None
 
 def _parse_quote(data: dict) -> dict:
@@ -375,59 +1012,267 @@ def _parse_quote(data: dict) -> dict:
     except Exception:
         return {}
 
+def _yf_spark(session: requests.Session, crumb: str, symbols: tuple) -> dict:
+    """
+    Um request do endpoint spark para até YF_LOTE símbolos.
+    Cada item de spark.result[].response tem o mesmo formato de chart.result,
+    então _parse_quote é reaproveitado item a item. Roda em threads do pool;
+    sessão e crumb chegam prontos de _yf_auth().
+    """
+    try:
+        r = session.get(_YF_SPARK_URL, timeout=12, params={
+            "symbols": ",".join(symbols), "range": "5d", "interval": "1d", "crumb": crumb,
+        })
+        if r.status_code in (401, 429):
+            _yf_auth().invalidate(crumb)
+        if r.status_code != 200:
+            return {}
+        itens = (r.json().get("spark") or {}).get("result") or []
+    except Exception:
+        return {}
+    por_simbolo = {str(it.get("symbol", "")).upper(): it.get("response") or [] for it in itens}
+    results = {}
+    for sym in symbols:
+        resp = por_simbolo.get(sym.upper())
+        if resp:
+            results[sym] = _parse_quote({"chart": {"result": resp}})
+    return results
+
 # ─── YAHOO FINANCE — funções públicas ────────────────────────────────────────
 
-@st.cache_data(ttl=900, show_spinner=False)
+def _spec_all_quotes(symbols: tuple) -> tuple:
+    return ("yf_quotes", tuple(symbols)), lambda: _fetch_all_quotes(tuple(symbols)), TTL_MERCADOS
+
+# Snapshot único de cotações: todos os símbolos de GLOBAL, renovados por uma
+# única thread por processo (_loop_cotacoes). Início e Mercados de todas as
+# sessões leem a mesma fotografia — o custo no upstream não depende de quantas
+# abas estão abertas, e os tiles de todo mundo viram juntos.
+_SIMBOLOS_GLOBAL = tuple(g.simbolo for g in GLOBAL.values())
+
+class Cotacoes(NamedTuple):
+    versao: int                # 0 = nada publicado ainda; sobe só quando o conteúdo muda
+    quotes: dict               # {symbol: quote_dict}
+    obtido: datetime | None    # quando esta versão foi publicada
+
+def _publicar(estado: dict, quotes: dict) -> None:
+    """
+    Funde a rodada no snapshot atual e publica nova versão se algo mudou.
+    Símbolos que falharam na rodada mantêm a última cotação boa; rodada vazia
+    (upstream fora) não publica nada.
+    """
+    with estado["lock"]:
+        atual = estado["pub"]
+        novo  = {**atual.quotes, **{sym: q for sym, q in quotes.items() if q}}
+        if novo != atual.quotes:
+            estado["pub"] = Cotacoes(atual.versao + 1, novo, datetime.now())
+    estado["pronto"].set()
+
+def _loop_cotacoes(estado: dict) -> None:
+    while True:
+        try:
+            quotes = _fetch_all_quotes(_SIMBOLOS_GLOBAL)
+        except Exception as e:
+            logger.warning("Poller de cotações: %s", e)
+            quotes = {}
+        _publicar(estado, quotes)
+        if estado["acordar"].wait(COTACOES_INTERVALO):
+            estado["acordar"].clear()
+
+@st.cache_resource(show_spinner=False)
+def _poller_cotacoes() -> dict:
+    """
+    Sobe (uma vez por processo) a thread dona do snapshot de GLOBAL. `pronto`
+    abre na 1ª rodada ou COTACOES_ESPERA s depois da subida, o que vier antes:
+    rodada lenta (upstream fora) não segura cada render pelo prazo inteiro.
+    """
+    estado = {"lock": threading.Lock(), "pub": Cotacoes(0, {}, None),
+              "pronto": threading.Event(), "acordar": threading.Event()}
+    threading.Thread(target=_loop_cotacoes, args=(estado,), daemon=True, name="cotacoes").start()
+    prazo = threading.Timer(COTACOES_ESPERA, estado["pronto"].set)
+    prazo.daemon = True
+    prazo.start()
+    return estado
+
+def get_cotacoes() -> Cotacoes:
+    """
+    Última publicação do poller — leitura em memória, sem rede. Só nos primeiros
+    COTACOES_ESPERA s de um processo frio pode esperar pela primeira rodada;
+    depois disso sai na hora (snapshot vazio → "—" até o próximo run_every).
+    """
+    estado = _poller_cotacoes()
+    estado["pronto"].wait(COTACOES_ESPERA)
+    return estado["pub"]
+
+def get_quotes_snapshot() -> dict:
+    """{symbol: quote_dict} de todos os ativos de GLOBAL (cópia rasa do snapshot publicado)."""
+    return dict(get_cotacoes().quotes)
+
 def get_all_quotes(symbols: tuple) -> dict:
     """
-    Busca cotações de uma lista de símbolos de forma sequencial e com
-    espaçamento entre requests, evitando o burst de 429 que ocorre quando
-    15 get_quote() independentes são chamados no mesmo ciclo de render.
+    Cotações de vários símbolos em lotes — poucos requests em vez de um por ativo.
+    Símbolos de GLOBAL saem do snapshot compartilhado (get_quotes_snapshot).
+
+    Os símbolos são agrupados em lotes de YF_LOTE no endpoint spark, buscados
+    com até YF_MAX_CONEXOES em paralelo e ritmados pelo token bucket AIMD
+    do host (net.py) em vez de sleeps fixos. Símbolos que o spark
+    não devolver caem no request individual do chart. Os 15 ativos de GLOBAL
+    saem em 2 requests, bem abaixo de 1s, sem rajada que dispare 429.
 
     Recebe uma tuple (hashável para cache) e retorna dict {symbol: quote_dict}.
-    Cache de 15min — alinhado com st.fragment(run_every=900).
+    Fora de GLOBAL: cache SWR de TTL_MERCADOS (15min).
 
     Uso no app.py:
-        quotes = get_all_quotes(tuple(sym for sym, _, _ in GLOBAL.values()))
+        quotes = get_all_quotes(tuple(g.simbolo for g in GLOBAL.values()))
         d = quotes.get(GLOBAL["IBOVESPA"].simbolo, {})
     """
+    if set(symbols) <= set(_SIMBOLOS_GLOBAL):
+        snap = get_quotes_snapshot()
+        return {sym: snap.get(sym, {}) for sym in symbols}
+    return _build_with_fallback(*_spec_all_quotes(symbols))
+
+def _fetch_all_quotes(symbols: tuple) -> dict:
     results = {}
-    for i, sym in enumerate(symbols):
-        # Espaçamento crescente: 0.3s base + jitter, aumenta levemente com o índice
-        # para distribuir os 15 requests ao longo de ~6s no total
-        if i > 0:
-            time.sleep(0.3 + random.uniform(0.1, 0.3) + i * 0.02)
-        data = _yf_request(sym, {"interval": "1d", "range": "5d"})
-        results[sym] = _parse_quote(data) if data else {}
+    lotes   = [symbols[i:i + YF_LOTE] for i in range(0, len(symbols), YF_LOTE)]
+    try:
+        session, crumb = _get_yf_session()
+    except Exception as e:
+        # sem cookie+crumb o fallback por símbolo falharia do mesmo jeito, N vezes
+        logger.warning("Yahoo sem sessão — cotações puladas neste ciclo: %s", e)
+        return {sym: {} for sym in symbols}
+    if lotes:
+        with ThreadPoolExecutor(max_workers=min(len(lotes), YF_MAX_CONEXOES),
+                                thread_name_prefix="yf") as pool:
+            for parcial in pool.map(lambda lote: _yf_spark(session, crumb, lote), lotes):
+                results.update(parcial)
+    for sym in symbols:
+        if not results.get(sym):
+            data = _yf_request(sym, {"interval": "1d", "range": "5d"})
+            results[sym] = _parse_quote(data) if data else {}
     return results
 
-@st.cache_data(ttl=900, show_spinner=False)
+def _fetch_quote(symbol: str) -> dict:
+    data = _yf_request(symbol, {"interval": "1d", "range": "5d"})
+    return _parse_quote(data) if data else {}
+
 def get_quote(symbol: str) -> dict:
     """
-    Cotação de um único símbolo. Cache de 15min.
-    Mantida para compatibilidade com chamadas individuais (ex: página Início).
-    Para a página Mercados Globais, prefira get_all_quotes().
+    Cotação de um único símbolo. Símbolos de GLOBAL vêm do snapshot
+    compartilhado; os demais têm entrada SWR própria (TTL_MERCADOS).
     """
-    data = _yf_request(symbol, {"interval": "1d", "range": "5d"})
-    return _parse_quote(data) if data else {}
+    if symbol in _SIMBOLOS_GLOBAL:
+        return get_quotes_snapshot().get(symbol, {})
+    return _build_with_fallback(("yf_quote", symbol), lambda: _fetch_quote(symbol), TTL_MERCADOS)
+
+def _spec_hist(symbol: str) -> tuple:
+    return ("yf_hist", symbol), lambda: _fetch_hist(symbol), TTL_HIST
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def get_hist(symbol: str, years: int = 5) -> pd.DataFrame:
     """
-    Histórico diário de fechamento. Cache de 1h.
+    Histórico diário de fechamento dos últimos `years` anos. Cache SWR de
+    TTL_HIST (1h) por símbolo: todas as janelas são fatias do mesmo histórico
+    de YF_HIST_ANOS, então trocar o horizonte não gera request.
     Retorna DataFrame com colunas [data, valor], ou vazio em caso de falha.
     """
-    data = _yf_request(symbol, {"interval": "1d", "range": f"{years}y"})
+    df = _build_with_fallback(*_spec_hist(symbol))
+    if df.empty:
+        return df
+    ini   = pd.Timestamp.today().normalize() - pd.DateOffset(years=years)
+    fatia = df.iloc[df["data"].searchsorted(ini):].reset_index(drop=True)
+    fatia.attrs = dict(df.attrs)
+    return fatia
+
+def _parse_hist(data: dict | None) -> pd.DataFrame:
+    """Payload do chart → [data, valor], uma linha por pregão (data no fuso da bolsa)."""
     if not data:
         return pd.DataFrame(columns=["data", "valor"])
     try:
         res    = data["chart"]["result"][0]
-        ts     = res["timestamp"]
-        closes = res["indicators"]["quote"][0]["close"]
+        offset = res.get("meta", {}).get("gmtoffset") or 0
         df = pd.DataFrame({
-            "data":  pd.to_datetime(ts, unit="s"),
-            "valor": closes,
+            "data":  pd.to_datetime(pd.Series(res["timestamp"]) + offset, unit="s").dt.normalize(),
+            "valor": res["indicators"]["quote"][0]["close"],
         })
-        return df.dropna().reset_index(drop=True)
+        df = df.dropna().drop_duplicates(subset="data", keep="last")
+        return df.sort_values("data").reset_index(drop=True)
     except Exception:
         return pd.DataFrame(columns=["data", "valor"])
+
+def _fetch_hist(symbol: str) -> pd.DataFrame:
+    """
+    Histórico persistido em store.py. Primeira carga: YF_HIST_ANOS de uma vez.
+    Depois, só period1 = último pregão gravado − YF_HIST_RELEITURA_DIAS até
+    agora — um request pequeno por refresh em vez do histórico inteiro.
+    """
+    gravado = store.load_yf_hist(symbol)
+    if gravado.empty:
+        df = _parse_hist(_yf_request(symbol, {"interval": "1d", "range": f"{YF_HIST_ANOS}y"}))
+        store.save_yf_hist(symbol, df)
+        return _congelar(df, symbol) if not df.empty else df
+    p1  = gravado["data"].iloc[-1] - timedelta(days=YF_HIST_RELEITURA_DIAS)
+    raw = _yf_request(symbol, {
+        "interval": "1d", "period1": int(p1.timestamp()), "period2": int(time.time()),
+    })
+    if raw is None:
+        raise FalhaUpstream(f"histórico {symbol} indisponível", _congelar(gravado, symbol))
+    novo = _parse_hist(raw)
+    store.save_yf_hist(symbol, novo)
+    return _congelar(_merge_incremental(gravado, novo), symbol)
+
+# ─── AQUECIMENTO EM BACKGROUND ───────────────────────────────────────────────
+def _tarefas_aquecimento() -> list:
+    """
+    (chave, builder, ttl) de tudo que o scheduler mantém quente — as mesmas
+    specs usadas pelas funções públicas, então as chaves SWR coincidem.
+    """
+    codigos = {s.codigo for s in SGS.values()} | {433} | {n.codigo for n in NUCLEO_SGS.values()}
+    tarefas = [_spec_bcb_full(c) for c in sorted(codigos)]
+    tarefas.append(_spec_sidra(60))
+    tarefas += [_spec_focus_anual(5), _spec_focus_12m(3)]
+    tarefas += [_spec_hist(g.simbolo) for g in GLOBAL.values()]
+    return tarefas
+
+def _aquecer(chave: tuple, builder, ttl: int) -> None:
+    """Refaz a chave se faltar ou se estiver a menos de AQUECIMENTO_MARGEM do TTL."""
+    reg = _swr_registry()
+    reg["builders"].setdefault(chave, builder)
+    ent = reg["entradas"].get(chave)
+    if ent is None:
+        _rebuild(chave, builder, None)
+    elif (time.time() - ent["ts"]) >= ttl * (1 - AQUECIMENTO_MARGEM) and _reservar(ent):
+        _rebuild(chave, builder, ent)
+
+def _log_upstreams(anterior: dict) -> dict:
+    """
+    Uma linha de log por tick com a taxa AIMD e o circuito de cada host — só
+    quando algo mudou; sobe para warning enquanto houver circuito não fechado.
+    """
+    atual = {"taxas": taxas(), "circuitos": circuitos()}
+    if atual != anterior:
+        abertos = {h: e for h, e in atual["circuitos"].items() if e != "fechado"}
+        logger.log(logging.WARNING if abertos else logging.INFO,
+                   "net: taxas %s · circuitos abertos %s", atual["taxas"], abertos or "nenhum")
+    return atual
+
+def _loop_aquecimento() -> None:
+    upstreams = {}
+    while True:
+        for chave, builder, ttl in _tarefas_aquecimento():
+            try:
+                _aquecer(chave, builder, ttl)
+            except Exception as e:
+                logger.warning("Aquecimento %s: %s", chave, e)
+        upstreams = _log_upstreams(upstreams)
+        time.sleep(AQUECIMENTO_TICK)
+
+@st.cache_resource(show_spinner=False)
+def iniciar_aquecimento() -> threading.Thread:
+    """
+    Sobe (uma vez por processo) a thread que renova SGS, núcleos, Focus, SIDRA
+    e Yahoo pouco antes do TTL de settings expirar — o usuário nunca paga o
+    fetch frio. Também sobe o poller de cotações. Chamar no topo do app.py;
+    chamadas seguintes são no-op.
+    """
+    _poller_cotacoes()
+    t = threading.Thread(target=_loop_aquecimento, daemon=True, name="aquecimento")
+    t.start()
+    return t
@@ -0,0 +1,260 @@
+"""
+net.py — Sessões HTTP compartilhadas e rate limit por host upstream.
+Uma requests.Session por host, criada uma vez por processo via st.cache_resource
+e reaproveitada por todas as sessões de browser: keep-alive evita um handshake
+TCP+TLS por request/retry/página OData, e o HTTPAdapter concentra pool e retry.
+Todo request passa pelo token bucket AIMD do seu host (LIMITES_HOST): sessões
+concorrentes dividem o mesmo orçamento em vez de disputá-lo, e um 429 reduz a
+taxa para todo o processo. Um circuit breaker por host corta os requests na
+hora quando o upstream cai, em vez de cada visitante esperar os timeouts.
+"""
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from settings import (logger, HTTP_POOL_MAXSIZE, HTTP_RETRIES, HTTP_BACKOFF,
+                      LIMITES_HOST, LIMITE_AUMENTO, LIMITE_CORTE, LIMITE_JANELA, LIMITE_PAUSA_MAX,
+                      DISJUNTOR_FALHAS, DISJUNTOR_ESPERA, DISJUNTOR_SONDA_TIMEOUT)
+
+# Hosts cuja cadeia TLS falha em alguns ambientes — mesmo verify=False de antes
+_SEM_VERIFY = {"api.bcb.gov.br"}
+
+
+# ── Rate limit ───────────────────────────────────────────────────────────────
+class _Limitador:
+    """
+    Token bucket thread-safe com taxa adaptativa (AIMD).
+    Requests saem imediatamente enquanto houver tokens (rajada) e, depois, no
+    ritmo `taxa` por segundo. sucesso() sobe a taxa aos poucos; estrangulado()
+    corta pela metade (no máximo uma vez por LIMITE_JANELA) e zera o bucket —
+    ou o deixa negativo pelo Retry-After, pausando o host inteiro.
+    """
+    def __init__(self, taxa: float, capacidade: float, piso: float, teto: float):
+        self.taxa       = float(taxa)
+        self.capacidade = float(capacidade)
+        self.piso       = float(piso)
+        self.teto       = float(teto)
+        self._tokens    = float(capacidade)
+        self._ts        = time.monotonic()
+        self._corte     = 0.0
+        self._lock      = threading.Lock()
+
+    def _repor(self, agora: float) -> None:
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ts) * self.taxa)
+        self._ts     = agora
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                self._repor(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                espera = (1 - self._tokens) / self.taxa
+            time.sleep(espera)
+
+    def sucesso(self) -> None:
+        with self._lock:
+            self.taxa = min(self.teto, self.taxa + LIMITE_AUMENTO)
+
+    def estrangulado(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            agora = time.monotonic()
+            self._repor(agora)
+            if agora - self._corte >= LIMITE_JANELA:
+                self.taxa   = max(self.piso, self.taxa * LIMITE_CORTE)
+                self._corte = agora
+            pausa = min(retry_after or 0.0, LIMITE_PAUSA_MAX)
+            self._tokens = min(self._tokens, 0.0) - pausa * self.taxa
+
+
+def _grupo(host: str) -> str | None:
+    """Chave de LIMITES_HOST que cobre `host` (ele mesmo ou um subdomínio)."""
+    for chave in LIMITES_HOST:
+        if host == chave or host.endswith("." + chave):
+            return chave
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def _limitadores() -> dict:
+    """Um _Limitador por entrada de LIMITES_HOST — um registro por processo."""
+    return {chave: _Limitador(*cfg) for chave, cfg in LIMITES_HOST.items()}
+
+
+def limitador(url: str) -> _Limitador | None:
+    """Bucket do host de `url`; None se o host não tem limite configurado."""
+    chave = _grupo(urlsplit(url).hostname or "")
+    return _limitadores()[chave] if chave else None
+
+
+def taxas() -> dict:
+    """{host: taxa atual em req/s} — estado corrente do AIMD de cada upstream."""
+    return {chave: round(lim.taxa, 3) for chave, lim in _limitadores().items()}
+
+
+# ── Circuit breaker ──────────────────────────────────────────────────────────
+class CircuitoAberto(requests.ConnectionError):
+    """Request recusado sem rede: o circuito do host está aberto."""
+
+
+class _Disjuntor:
+    """
+    Circuit breaker de um host: fechado → aberto após DISJUNTOR_FALHAS falhas
+    seguidas. Aberto, permite() é só a leitura de um atributo — o request falha
+    em microssegundos. A reabertura é decidida por uma sonda em background
+    (meio-aberto) que refaz o último request que falhou a cada DISJUNTOR_ESPERA s;
+    nenhum visitante paga a sonda.
+    """
+    def __init__(self, host: str):
+        self.host    = host
+        self.estado  = "fechado"
+        self._falhas = 0
+        self._lock   = threading.Lock()
+
+    def permite(self) -> bool:
+        return self.estado == "fechado"
+
+    def sucesso(self) -> None:
+        with self._lock:
+            self._falhas = 0
+            reabriu      = self.estado != "fechado"
+            self.estado  = "fechado"
+        if reabriu:
+            logger.warning("net: %s respondeu — circuito fechado", self.host)
+
+    def falha(self, sonda) -> None:
+        """Conta uma falha; `sonda()` refaz o request e diz se o host respondeu."""
+        with self._lock:
+            self._falhas += 1
+            if self.estado != "fechado" or self._falhas < DISJUNTOR_FALHAS:
+                return
+            self.estado = "aberto"
+        logger.warning("net: %s falhou %d vezes seguidas — circuito aberto", self.host, self._falhas)
+        self._agendar(sonda)
+
+    def _agendar(self, sonda) -> None:
+        t = threading.Timer(DISJUNTOR_ESPERA, self._sondar, args=(sonda,))
+        t.daemon = True
+        t.name   = f"sonda-{self.host}"
+        t.start()
+
+    def _sondar(self, sonda) -> None:
+        with self._lock:
+            self.estado = "meio-aberto"
+        try:
+            ok = sonda()
+        except Exception:
+            ok = False
+        if ok:
+            self.sucesso()
+            return
+        with self._lock:
+            if self.estado == "meio-aberto":
+                self.estado = "aberto"
+        self._agendar(sonda)
+
+
+@st.cache_resource(show_spinner=False)
+def _disjuntores() -> dict:
+    """Um _Disjuntor por entrada de LIMITES_HOST — um registro por processo."""
+    return {chave: _Disjuntor(chave) for chave in LIMITES_HOST}
+
+
+def disjuntor(url: str) -> _Disjuntor | None:
+    """Circuit breaker do host de `url`; None se o host não está em LIMITES_HOST."""
+    chave = _grupo(urlsplit(url).hostname or "")
+    return _disjuntores()[chave] if chave else None
+
+
+def circuitos() -> dict:
+    """{host: 'fechado' | 'aberto' | 'meio-aberto'} — estado de cada upstream."""
+    return {chave: d.estado for chave, d in _disjuntores().items()}
+
+
+# ── Adapter ──────────────────────────────────────────────────────────────────
+def _retry_after(r: requests.Response) -> float | None:
+    try:
+        return float(r.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+class _AdapterLimitado(HTTPAdapter):
+    """
+    HTTPAdapter que passa cada envio pelo circuit breaker e pelo bucket do
+    host. 429 não entra no Retry do urllib3 (que dormiria por conta própria):
+    aqui ele corta a taxa do host e o reenvio espera o próprio bucket. Falhas
+    de conexão, timeouts e 5xx (já depois do Retry) contam para o breaker.
+    """
+    def send(self, request, **kwargs):
+        disj = disjuntor(request.url)
+        if disj is None:
+            return super().send(request, **kwargs)
+        if not disj.permite():
+            raise CircuitoAberto(f"{disj.host}: circuito aberto", request=request)
+        sonda = lambda: self._sonda(request, kwargs)
+        try:
+            r = self._enviar(request, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            disj.falha(sonda)
+            raise
+        if r.status_code >= 500:
+            disj.falha(sonda)
+        else:
+            disj.sucesso()
+        return r
+
+    def _sonda(self, request, kwargs: dict) -> bool:
+        r = self._enviar(request, **{**kwargs, "timeout": DISJUNTOR_SONDA_TIMEOUT})
+        r.close()
+        return r.status_code < 500
+
+    def _enviar(self, request, **kwargs):
+        lim = limitador(request.url)
+        for tentativa in range(HTTP_RETRIES + 1):
+            lim.acquire()
+            r = super().send(request, **kwargs)
+            if r.status_code != 429:
+                if r.status_code < 500:
+                    lim.sucesso()
+                return r
+            lim.estrangulado(_retry_after(r))
+            logger.info("net: 429 de %s — taxa reduzida para %.2f req/s",
+                        urlsplit(request.url).hostname, lim.taxa)
+            if tentativa < HTTP_RETRIES:
+                r.close()
+        return r
+
+
+def nova_sessao(verify: bool = True) -> requests.Session:
+    """requests.Session com pool keep-alive, retry de conexão/5xx e rate limit por host."""
+    retry = Retry(
+        total=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = _AdapterLimitado(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    s = requests.Session()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.verify = verify
+    return s
+
+
+# ── Sessões ──────────────────────────────────────────────────────────────────
+@st.cache_resource(show_spinner=False)
+def _session_for_host(host: str) -> requests.Session:
+    return nova_sessao(verify=host not in _SEM_VERIFY)
+
+
+def session_for(url: str) -> requests.Session:
+    """Sessão keep-alive do host de `url` — uma por processo."""
+    return _session_for_host(urlsplit(url).hostname or "")
@@ -0,0 +1,100 @@
+"""
+paginas/expectativas.py — Expectativas: projeções Focus (anuais e 12 meses).
+Executada por st.navigation em app.py; só roda quando é a página ativa.
+"""
+import pandas as pd
+import streamlit as st
+
+from settings import H_LARGE, FOCUS_INDICADORES, FOCUS_INDICADORES_12M
+from data import get_focus_anual, get_focus_12m
+from charts import line_fig
+from components import fmt, page_header, sec_title, kpi_card, stale_banner, render_chart, cronometro
+
+# Indicador e prazo ficam dentro do fragment: trocar um deles refaz só o bloco Focus.
+@st.fragment
+def _secao_focus():
+    """Seletor Focus (indicador × prazo), KPIs, série da mediana e CSV."""
+    with cronometro("Expectativas/Focus"):
+        fe1, fe2 = st.columns([2, 2])
+        with fe1:
+            ind_focus = st.selectbox("Indicador", FOCUS_INDICADORES, key="find",
+                help="Indicador econômico monitorado pelas instituições do Focus")
+        with fe2:
+            _suporta_12m  = ind_focus in FOCUS_INDICADORES_12M
+            _opcoes_prazo = (["Próximos 12 meses", "Expectativas anuais"] if _suporta_12m
+                             else ["Ano corrente (proxy)", "Expectativas anuais"])
+            prazo_focus = st.selectbox("Prazo", _opcoes_prazo, key="fprazo",
+                help="'Próximos 12 meses' disponível apenas para indicadores de inflação")
+        with st.spinner(f"Carregando Focus — {ind_focus}..."):
+            df_focus = (get_focus_12m(ind_focus, anos=3)
+                        if prazo_focus == "Próximos 12 meses"
+                        else get_focus_anual(ind_focus, anos=5))
+        stale_banner(df_focus, f"Focus {ind_focus}")
+        if df_focus.empty:
+            st.warning("⚠️ Dados do Boletim Focus indisponíveis para este indicador.")
+        else:
+            _ult   = df_focus.iloc[-1]
+            _ant   = df_focus.iloc[-2] if len(df_focus) >= 2 else _ult
+            _delta = float(_ult["mediana"] - _ant["mediana"])
+            _ref   = f"Ref: {_ult['data'].strftime('%d/%m/%Y')}"
+            kc1, kc2, kc3, kc4 = st.columns(4)
+            with kc1:
+                kpi_card("Mediana (última)", f"{fmt(_ult['mediana'])}%",
+                         chg_p=_delta * 100 / _ant["mediana"] if _ant["mediana"] else None, sub=_ref)
+            with kc2:
+                kpi_card("Mínimo (última)",
+                         f"{fmt(_ult['minimo'])}%" if pd.notna(_ult.get("minimo")) else "—", sub=_ref)
+            with kc3:
+                kpi_card("Máximo (última)",
+                         f"{fmt(_ult['maximo'])}%" if pd.notna(_ult.get("maximo")) else "—", sub=_ref)
+            with kc4:
+                kpi_card("Desvio padrão",
+                         f"{fmt(_ult['desvio'])}%" if pd.notna(_ult.get("desvio")) else "—",
+                         sub="Dispersão das expectativas")
+
+            st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
+            _df_plot = df_focus[["data", "mediana"]].rename(columns={"mediana": "valor"})
+            _xmax_f  = _df_plot["data"].max()
+            _xmin_f  = _xmax_f - pd.DateOffset(years=2)
+            fig_focus = line_fig(_df_plot, f"Focus — {ind_focus} ({prazo_focus})",
+                                 "#1a2035", suffix="%", height=H_LARGE,
+                                 inter=True, x_ini=_xmin_f, x_fim=_xmax_f)
+            render_chart(fig_focus, f"focus_{ind_focus.lower().replace(' ', '_')}")
+
+            if prazo_focus == "Expectativas anuais":
+                _anos_disp = sorted(df_focus["ano_ref"].unique(), reverse=True)
+                sec_title("Expectativas por Ano de Referência")
+                _pivot = []
+                for _ano in _anos_disp[:5]:
+                    _df_ano = df_focus[df_focus["ano_ref"] == _ano].sort_values("data")
+                    if not _df_ano.empty:
+                        _last = _df_ano.iloc[-1]
+                        _pivot.append({
+                            "Ano":      _ano,
+                            "Mediana":  f"{fmt(_last['mediana'])}%",
+                            "Mínimo":   f"{fmt(_last['minimo'])}%"  if pd.notna(_last.get("minimo"))  else "—",
+                            "Máximo":   f"{fmt(_last['maximo'])}%"  if pd.notna(_last.get("maximo"))  else "—",
+                            "Desvio":   f"{fmt(_last['desvio'])}%"  if pd.notna(_last.get("desvio"))  else "—",
+                            "Ref. data": _last["data"].strftime("%d/%m/%Y"),
+                        })
+                if _pivot:
+                    st.dataframe(pd.DataFrame(_pivot), hide_index=True, use_container_width=True)
+
+            _dlo_f = df_focus.copy()
+            _dlo_f["data"] = _dlo_f["data"].dt.strftime("%d/%m/%Y")
+            st.download_button(
+                f"💾 Baixar CSV ({len(_dlo_f)} linhas)",
+                data=_dlo_f.to_csv(index=False).encode("utf-8-sig"),
+                file_name=f"focus_{ind_focus.replace(' ', '_').replace('/', '-')}_{prazo_focus[:5]}.csv",
+                mime="text/csv",
+            )
+
+
+page_header("Expectativas de Mercado")
+st.markdown(
+    "<div style='font-size:12px;color:#6b7280;margin:0 0 18px'>"
+    "Medianas do <b>Boletim Focus</b> — pesquisa semanal do BCB com ~130 instituições financeiras. "
+    "Atualizado toda segunda-feira.</div>",
+    unsafe_allow_html=True,
+)
+_secao_focus()
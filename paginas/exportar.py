@@ -0,0 +1,140 @@
+"""
+paginas/exportar.py — Exportar: download CSV das séries BCB e Yahoo.
+Executada por st.navigation em app.py; só roda quando é a página ativa.
+"""
+import pandas as pd
+from datetime import datetime, timedelta
+import streamlit as st
+
+from settings import logger, GLOBAL, SGS, SGS_PERIODOS, PERIODOS_ORIGINAIS, P_ORIGINAL
+from data import get_hist, get_bcb_full, aplicar_periodo, recarregar
+from components import page_header
+
+page_header("Exportar Dados")
+fonte = st.radio("Fonte:", ["BCB/SGS — Brasil", "Yahoo Finance — Globais"], horizontal=True)
+st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
+
+if fonte == "BCB/SGS — Brasil":
+    c1, c2 = st.columns([2, 2])
+    with c1: ind = st.selectbox("Indicador", list(SGS.keys()), index=1, key="eind")
+    opts_e = SGS_PERIODOS.get(ind, [P_ORIGINAL])
+    with c2:
+        periodo_e = st.selectbox("Período / Transformação", opts_e, key="eperiodo") if len(opts_e) > 1 else opts_e[0]
+    c3, c4 = st.columns(2)
+    with c3: d_ini = st.date_input("De",  value=datetime.today() - timedelta(days=365 * 5), key="eini")
+    with c4: d_fim = st.date_input("Até", value=datetime.today(), key="efim")
+    modo = st.radio("Dados:", ["Filtrar pelo intervalo acima", "Série completa desde o início"],
+                    horizontal=True, key="emodo")
+    if st.button("Gerar CSV", type="primary", key="ebtn"):
+        s = SGS[ind]
+        try:
+            with st.spinner(f"Carregando {ind}..."):
+                dfe = get_bcb_full(s.codigo)
+                if "completa" not in modo and not dfe.empty:
+                    dfe = dfe[
+                        (dfe["data"] >= pd.Timestamp(d_ini)) &
+                        (dfe["data"] <= pd.Timestamp(d_fim))
+                    ].reset_index(drop=True)
+        except Exception as e:
+            logger.error("Exportar BCB: %s", e)
+            dfe = pd.DataFrame(columns=["data", "valor"])
+        if dfe.empty:
+            col_e, col_b = st.columns([6, 1])
+            with col_e: st.warning(f"⚠️ Nenhum dado para {ind}.")
+            with col_b:
+                st.button("↺", key="retry_exp_bcb", on_click=recarregar, args=(("sgs", s.codigo),))
+        else:
+            dfe2, unit_t = aplicar_periodo(dfe, periodo_e, ind)
+            if not unit_t: unit_t = s.unidade
+            if dfe2.empty:
+                st.warning("Transformação resultou em série vazia.")
+            else:
+                label_e = (f"{ind} — {periodo_e}" if periodo_e not in PERIODOS_ORIGINAIS else ind)
+                dlo = dfe2.copy()
+                dlo["data"] = dlo["data"].dt.strftime("%d/%m/%Y")
+                st.markdown(
+                    f"<div style='font-size:11px;color:#6b7280;margin:4px 0 8px'>"
+                    f"{len(dlo)} registros exportados</div>",
+                    unsafe_allow_html=True,
+                )
+                st.dataframe(
+                    dlo.rename(columns={"data": "Data", "valor": f"Valor ({unit_t})"}),
+                    use_container_width=True,
+                    height=min(400, 46 + len(dlo) * 35),
+                )
+                nome = f"{ind.replace(' ', '_')}_{periodo_e.replace(' ', '_').replace('/', '')}.csv"
+                st.download_button(f"💾 Baixar {nome}",
+                    data=dlo.to_csv(index=False).encode("utf-8-sig"),
+                    file_name=nome, mime="text/csv")
+else:
+    co1, co2 = st.columns([2, 1])
+    with co1: ativo = st.selectbox("Ativo", list(GLOBAL.keys()), key="eativo")
+    with co2: anos  = st.select_slider("Período (anos)", [1, 2, 3, 5, 10], value=5, key="eanos")
+    if st.button("Gerar CSV", type="primary", key="ebtn2"):
+        g = GLOBAL[ativo]
+        try:
+            with st.spinner(f"Buscando {ativo}..."): dfe = get_hist(g.simbolo, anos)
+        except Exception as e:
+            logger.error("Exportar Yahoo: %s", e)
+            dfe = pd.DataFrame(columns=["data", "valor"])
+        if dfe.empty:
+            col_e, col_b = st.columns([6, 1])
+            with col_e: st.warning(f"⚠️ Histórico de {ativo} indisponível.")
+            with col_b:
+                st.button("↺", key="retry_exp_yf", on_click=recarregar, args=(("yf_hist", g.simbolo),))
+        else:
+            dlo = dfe.copy()
+            dlo["data"] = dlo["data"].dt.strftime("%d/%m/%Y")
+            st.markdown(
+                f"<div style='font-size:11px;color:#6b7280;margin:4px 0 8px'>"
+                f"{len(dlo)} registros exportados</div>",
+                unsafe_allow_html=True,
+            )
+            st.dataframe(
+                dlo.rename(columns={"data": "Data", "valor": f"Valor ({g.unidade})"}),
+                use_container_width=True,
+                height=min(400, 46 + len(dlo) * 35),
+            )
+            nome = f"{ativo.replace(' ', '_')}_{anos}anos.csv"
+            st.download_button(f"💾 Baixar {nome}",
+                data=dlo.to_csv(index=False).encode("utf-8-sig"),
+                file_name=nome, mime="text/csv")
+
+st.markdown("<div style='height:24px'></div>", unsafe_allow_html=True)
+lbl = ("▲  Ocultar indicadores e ativos" if st.session_state.tabela_aberta
+       else "▼  Ver todos os indicadores e ativos disponíveis")
+def _alternar_tabela():
+    st.session_state.tabela_aberta = not st.session_state.tabela_aberta
+
+# callback roda antes do rerun do clique — o rótulo já sai certo, sem st.rerun() extra
+st.button(lbl, key="btn_tabela", use_container_width=False, on_click=_alternar_tabela)
+if st.session_state.tabela_aberta:
+    st.markdown(
+        "<div style='background:#fff;border:1px solid #e2e5e9;border-radius:12px;"
+        "padding:20px 24px;margin-top:4px'>",
+        unsafe_allow_html=True,
+    )
+    st.markdown("**BCB/SGS — Indicadores Brasil**")
+    df_sgs = pd.DataFrame([{
+        "Indicador":       k,
+        "Cód. SGS":        v.codigo,
+        "Unidade":         v.unidade,
+        "Freq.":           v.frequencia,
+        "Transformações":  ", ".join(SGS_PERIODOS.get(k, [P_ORIGINAL])),
+    } for k, v in SGS.items()])
+    st.dataframe(df_sgs, hide_index=True, use_container_width=True,
+                 height=46 + len(df_sgs) * 35)
+    st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
+    st.markdown("**Yahoo Finance — Ativos Globais**")
+    df_yf = pd.DataFrame([{
+        "Ativo":   k,
+        "Símbolo": v.simbolo,
+        "Unidade": v.unidade,
+        "Tipo":    ("Câmbio"    if k in ("Dólar (USD/BRL)", "Euro (EUR/BRL)") else
+                    "Índice"    if k in ("IBOVESPA", "S&P 500", "Nasdaq 100", "Dow Jones", "FTSE 100", "DAX") else
+                    "Commodity" if k in ("Petróleo Brent", "Petróleo WTI", "Ouro", "Prata", "Cobre") else
+                    "Cripto"),
+    } for k, v in GLOBAL.items()])
+    st.dataframe(df_yf, hide_index=True, use_container_width=True,
+                 height=46 + len(df_yf) * 35)
+    st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,210 @@
+"""
+paginas/graficos.py — Gráficos: séries BCB, ativos Yahoo e comparação entre séries.
+Executada por st.navigation em app.py; só roda quando é a página ativa.
+"""
+import pandas as pd
+from datetime import date
+import streamlit as st
+
+from settings import (
+    logger, GLOBAL, SGS, SGS_PERIODOS, PERIODOS_ORIGINAIS, P_ORIGINAL, H_LARGE,
+    SGS_DESCRICAO, GLOBAL_DESCRICAO,
+)
+from data import get_hist, get_bcb_full, get_bcb_many, aplicar_periodo, alinhar_series, recarregar
+from charts import line_fig, bar_fig, comparacao_fig
+from components import page_header, stale_banner, render_chart, cronometro, abas
+
+# Cada aba é um st.fragment: trocar indicador, período ou datas reexecuta só
+# a própria seção (busca em cache + figura), não a página inteira.
+@st.fragment
+def _secao_bcb():
+    """Aba BCB: indicador, transformação, janela e estatísticas."""
+    with cronometro("Gráficos/BCB"):
+        col1, col2 = st.columns([2, 2])
+        with col1:
+            ind = st.selectbox("Indicador", list(SGS.keys()), key="gind",
+                help=SGS_DESCRICAO.get(st.session_state.get("gind", list(SGS.keys())[0]), ""))
+        opts = SGS_PERIODOS.get(ind, [P_ORIGINAL])
+        with col2:
+            periodo = st.selectbox("Período / Transformação", opts, key="gperiodo") if len(opts) > 1 else opts[0]
+        s = SGS[ind]
+        cod, unit, freq, tipo, cor = s.codigo, s.unidade, s.frequencia, s.tipo, s.cor
+        try:
+            with st.spinner(f"Carregando {ind}..."): df_f = get_bcb_full(cod)
+        except Exception as e:
+            logger.error("Gráficos BCB: %s", e); df_f = pd.DataFrame(columns=["data", "valor"])
+        stale_banner(df_f, ind)
+        if df_f.empty:
+            col_e, col_b = st.columns([6, 1])
+            with col_e: st.warning(f"⚠️ Série {ind} indisponível.")
+            with col_b:
+                st.button("↺", key="retry_bcb", on_click=recarregar, args=(("sgs", cod),))
+        else:
+            df_t, unit_t = aplicar_periodo(df_f, periodo, ind)
+            if not unit_t: unit_t = unit
+            label_t = (f"{ind} — {periodo}" if periodo not in PERIODOS_ORIGINAIS
+                       else f"{ind} ({unit_t})")
+            dmin = df_t["data"].min().date()
+            dmax = df_t["data"].max().date()
+            st.markdown(
+                f"<div style='font-size:11px;color:#6b7280;margin:6px 0 14px'>"
+                f"Disponível: <strong>{dmin.strftime('%d/%m/%Y')}</strong> → "
+                f"<strong>{dmax.strftime('%d/%m/%Y')}</strong> · {len(df_t)} obs.</div>",
+                unsafe_allow_html=True,
+            )
+            _d24 = max(dmin, date(dmax.year - 2, dmax.month, dmax.day))
+            c2, c3 = st.columns(2)
+            with c2: d_ini = st.date_input("Exibir de",  value=_d24, min_value=dmin, max_value=dmax, key="gini")
+            with c3: d_fim = st.date_input("Exibir até", value=dmax, min_value=dmin, max_value=dmax, key="gfim")
+            if d_ini < d_fim:
+                st.markdown(
+                    f"<div style='font-size:11px;color:#6b7280;margin:4px 0 8px'>"
+                    f"{len(df_t)} obs. · {label_t} · {freq}</div>",
+                    unsafe_allow_html=True,
+                )
+                use_bar = (tipo == "bar") and (periodo in PERIODOS_ORIGINAIS)
+                fig = (bar_fig(df_t, label_t, suffix=f" {unit_t}", height=H_LARGE, inter=True, x_ini=d_ini, x_fim=d_fim)
+                       if use_bar
+                       else line_fig(df_t, label_t, cor, suffix=f" {unit_t}", height=H_LARGE, inter=True, x_ini=d_ini, x_fim=d_fim))
+                render_chart(fig, f"{ind}_{periodo}")
+                _dv = df_t[(df_t["data"] >= pd.Timestamp(d_ini)) & (df_t["data"] <= pd.Timestamp(d_fim))]["valor"].dropna()
+                if not _dv.empty:
+                    _sc1, _sc2, _sc3, _sc4, _sc5 = st.columns(5)
+                    for _col, _lbl, _val in zip(
+                        [_sc1, _sc2, _sc3, _sc4, _sc5],
+                        ["Último", "Média", "Mín", "Máx", "Desvio padrão"],
+                        [_dv.iloc[-1], _dv.mean(), _dv.min(), _dv.max(), _dv.std()],
+                    ):
+                        _col.metric(_lbl, f"{_val:,.2f}".replace(",", ".").replace(".", ",", 1) if _val == _val else "—")
+                dlo = df_t.copy()
+                dlo["data"] = dlo["data"].dt.strftime("%d/%m/%Y")
+                st.download_button(
+                    f"💾 Baixar CSV ({len(dlo)} linhas)",
+                    data=dlo.to_csv(index=False).encode("utf-8-sig"),
+                    file_name=f"{ind.replace(' ', '_')}_{periodo.replace(' ', '_')}.csv",
+                    mime="text/csv",
+                )
+
+
+@st.fragment
+def _secao_yahoo():
+    """Aba Yahoo: histórico de 10 anos do ativo escolhido."""
+    with cronometro("Gráficos/Yahoo"):
+        co1, _ = st.columns([2, 3])
+        with co1:
+            ativo = st.selectbox("Ativo", list(GLOBAL.keys()), key="gativo",
+                help=GLOBAL_DESCRICAO.get(st.session_state.get("gativo", list(GLOBAL.keys())[0]), ""))
+        g = GLOBAL[ativo]
+        try:
+            with st.spinner(f"Carregando {ativo}..."): dfg = get_hist(g.simbolo, years=10)
+        except Exception as e:
+            logger.error("Gráficos Yahoo: %s", e); dfg = pd.DataFrame(columns=["data", "valor"])
+        if not dfg.empty:
+            dmin_y = dfg["data"].min().date()
+            dmax_y = dfg["data"].max().date()
+            _d24y  = max(dmin_y, date(dmax_y.year - 2, dmax_y.month, dmax_y.day))
+            st.markdown(
+                f"<div style='font-size:11px;color:#6b7280;margin:6px 0 14px'>"
+                f"Disponível: <strong>{dmin_y.strftime('%d/%m/%Y')}</strong> → "
+                f"<strong>{dmax_y.strftime('%d/%m/%Y')}</strong> · {len(dfg)} obs.</div>",
+                unsafe_allow_html=True,
+            )
+            cy1, cy2 = st.columns(2)
+            with cy1: dy_ini = st.date_input("Exibir de",  value=_d24y,  min_value=dmin_y, max_value=dmax_y, key="gyini")
+            with cy2: dy_fim = st.date_input("Exibir até", value=dmax_y, min_value=dmin_y, max_value=dmax_y, key="gyfim")
+            if dy_ini < dy_fim:
+                st.markdown(
+                    f"<div style='font-size:11px;color:#6b7280;margin:4px 0 8px'>"
+                    f"{len(dfg)} obs. · {ativo}</div>",
+                    unsafe_allow_html=True,
+                )
+                fig_y = line_fig(dfg, f"{ativo}", g.cor, suffix=f" {g.unidade}",
+                                 height=H_LARGE, inter=True, x_ini=dy_ini, x_fim=dy_fim)
+                render_chart(fig_y, ativo)
+                _dvy = dfg[(dfg["data"] >= pd.Timestamp(dy_ini)) & (dfg["data"] <= pd.Timestamp(dy_fim))]["valor"].dropna()
+                if not _dvy.empty:
+                    _yc1, _yc2, _yc3, _yc4, _yc5 = st.columns(5)
+                    for _col, _lbl, _val in zip(
+                        [_yc1, _yc2, _yc3, _yc4, _yc5],
+                        ["Último", "Média", "Mín", "Máx", "Desvio padrão"],
+                        [_dvy.iloc[-1], _dvy.mean(), _dvy.min(), _dvy.max(), _dvy.std()],
+                    ):
+                        _col.metric(_lbl, f"{_val:,.2f}".replace(",", ".").replace(".", ",", 1) if _val == _val else "—")
+                dlo = dfg.copy()
+                dlo["data"] = dlo["data"].dt.strftime("%d/%m/%Y")
+                st.download_button(
+                    f"💾 Baixar CSV completo ({len(dlo)} linhas)",
+                    data=dlo.to_csv(index=False).encode("utf-8-sig"),
+                    file_name=f"{ativo.replace(' ', '_')}_completo.csv",
+                    mime="text/csv",
+                )
+        else:
+            col_e, col_b = st.columns([6, 1])
+            with col_e: st.warning(f"⚠️ Histórico de {ativo} indisponível.")
+            with col_b:
+                st.button("↺", key="retry_yf", on_click=recarregar, args=(("yf_hist", g.simbolo),))
+
+
+@st.fragment
+def _secao_comparacao():
+    """Aba Comparar: 2–3 séries BCB alinhadas no mesmo gráfico."""
+    with cronometro("Gráficos/Comparação"):
+        st.markdown(
+            "<div style='font-size:12px;color:#6b7280;margin:0 0 14px'>"
+            "Selecione 2 ou 3 indicadores BCB para comparar no mesmo gráfico. "
+            "Séries com unidades diferentes usam eixo Y duplo.</div>",
+            unsafe_allow_html=True,
+        )
+        _ind_lista = list(SGS.keys())
+        cc1, cc2, cc3 = st.columns(3)
+        with cc1: cind1 = st.selectbox("Indicador 1", _ind_lista, index=0, key="cind1")
+        with cc2: cind2 = st.selectbox("Indicador 2", _ind_lista, index=1, key="cind2")
+        with cc3: cind3 = st.selectbox("Indicador 3 (opcional)", ["—"] + _ind_lista, index=0, key="cind3")
+        _selecionados = [cind1, cind2] + ([cind3] if cind3 != "—" else [])
+        _series_comp = {}
+        try:
+            with st.spinner(f"Carregando {', '.join(_selecionados)}..."):
+                _comp_raw = get_bcb_many(SGS[_nome].codigo for _nome in _selecionados)
+        except Exception as e:
+            logger.error("Comparação: %s", e)
+            _comp_raw = {}
+        for _nome in _selecionados:
+            s = SGS[_nome]
+            _df_c = _comp_raw.get(s.codigo, pd.DataFrame(columns=["data", "valor"]))
+            stale_banner(_df_c, _nome)
+            _series_comp[_nome] = (_df_c, s.unidade)
+        _mat_comp = alinhar_series({_nome: _df_c for _nome, (_df_c, _) in _series_comp.items()})
+        _unid_comp = {_nome: _unit for _nome, (_, _unit) in _series_comp.items()}
+        if _mat_comp.shape[1] < 2:
+            st.warning("⚠️ Não foi possível carregar dados suficientes para comparar.")
+        else:
+            _obs_comp = _mat_comp.notna()
+            _dmin_c = _obs_comp.idxmax().max().date()          # 1ª observação de cada série
+            _dmax_c = _obs_comp[::-1].idxmax().min().date()    # última observação de cada série
+            _d24c   = max(_dmin_c, date(_dmax_c.year - 2, _dmax_c.month, _dmax_c.day))
+            cd1, cd2 = st.columns(2)
+            with cd1: dc_ini = st.date_input("Exibir de",  value=_d24c,  min_value=_dmin_c, max_value=_dmax_c, key="cini")
+            with cd2: dc_fim = st.date_input("Exibir até", value=_dmax_c, min_value=_dmin_c, max_value=_dmax_c, key="cfim")
+            if dc_ini < dc_fim:
+                fig_comp = comparacao_fig(_mat_comp, _unid_comp, _selecionados, x_ini=dc_ini, x_fim=dc_fim)
+                render_chart(fig_comp, "comparacao_series")
+                _jan_comp = (_mat_comp.loc[pd.Timestamp(dc_ini):pd.Timestamp(dc_fim)]
+                             .dropna(how="all")
+                             .rename(columns=lambda n: f"{n} ({_unid_comp[n]})"))
+                if not _jan_comp.empty:
+                    _df_export = _jan_comp.reset_index()
+                    _df_export["data"] = _df_export["data"].dt.strftime("%d/%m/%Y")
+                    st.download_button("💾 Baixar CSV comparação",
+                        data=_df_export.to_csv(index=False).encode("utf-8-sig"),
+                        file_name="comparacao_series.csv", mime="text/csv")
+
+
+page_header("Gráficos")
+# Abas preguiçosas: só a seção ativa busca dados e monta figura
+_ABAS = {
+    "BCB — Indicadores Brasil":       (_secao_bcb,        ("gind", "gperiodo", "gini", "gfim")),
+    "Yahoo Finance — Ativos Globais": (_secao_yahoo,      ("gativo", "gyini", "gyfim")),
+    "Comparar Séries":                (_secao_comparacao, ("cind1", "cind2", "cind3", "cini", "cfim")),
+}
+_aba = abas({rotulo: chaves for rotulo, (_, chaves) in _ABAS.items()}, key="graficos_aba")
+_ABAS[_aba][0]()
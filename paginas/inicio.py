@@ -0,0 +1,90 @@
+"""
+paginas/inicio.py — Início: cotações principais, KPIs econômicos e histórico de 12 meses.
+Executada por st.navigation em app.py; só roda quando é a página ativa.
+"""
+import pandas as pd
+import streamlit as st
+
+from settings import logger, GLOBAL, SGS, HOME_CHARTS, HOME_KPIS, COTACOES_INTERVALO, COTACOES_CHECAGEM
+from data import get_quotes_snapshot, get_bcb_many, recarregar
+from charts import line_fig, bar_fig
+from components import fmt, page_header, sec_title, kpi_card, stale_banner, render_chart
+
+# Cards de mercado leem o mesmo snapshot versionado dos tiles de Mercados;
+# o fragment só consulta a publicação do poller, sem rede
+@st.fragment(run_every=COTACOES_CHECAGEM)
+def _indicadores_mercado():
+    _quotes = get_quotes_snapshot()
+    ibov = _quotes.get(GLOBAL["IBOVESPA"].simbolo, {})
+    usd  = _quotes.get(GLOBAL["Dólar (USD/BRL)"].simbolo, {})
+    eur  = _quotes.get(GLOBAL["Euro (EUR/BRL)"].simbolo, {})
+    sec_title("Indicadores de Mercado", f"↻ {COTACOES_INTERVALO // 60}min", "badge-live")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        v = ibov.get("price")
+        kpi_card("IBOVESPA", fmt(v, 0) + " pts" if v else "—", ibov.get("chg_p"),
+                 sub=f"Var. dia: {fmt(ibov.get('chg_v'), 0)} pts" if ibov.get("chg_v") is not None else "", d=ibov)
+    with c2:
+        v = usd.get("price")
+        kpi_card("Dólar (USD/BRL)", f"R$ {fmt(v, 4)}" if v else "—", usd.get("chg_p"),
+                 sub=f"Ant.: R$ {fmt(usd.get('prev'), 4)}" if v else "", invert=True, d=usd)
+    with c3:
+        v = eur.get("price")
+        kpi_card("Euro (EUR/BRL)", f"R$ {fmt(v, 4)}" if v else "—", eur.get("chg_p"),
+                 sub=f"Ant.: R$ {fmt(eur.get('prev'), 4)}" if v else "", invert=True, d=eur)
+
+
+page_header("EQI Dashboard Macro")
+try:
+    with st.spinner("Carregando..."):
+        _home_raw  = get_bcb_many(SGS[nome].codigo for nome, _ in HOME_CHARTS)
+        _home_data = {nome: _home_raw[SGS[nome].codigo] for nome, _ in HOME_CHARTS}
+except Exception as e:
+    logger.error("Início: %s", e)
+    st.error("⚠️ Erro ao carregar dados.")
+    st.button("↺ Tentar novamente", on_click=recarregar, args=("sgs",))
+    st.stop()
+
+_indicadores_mercado()
+
+sec_title("Indicadores Econômicos", "↻ diário", "badge-daily")
+for nome, _, _ in HOME_KPIS:
+    stale_banner(_home_data.get(nome, pd.DataFrame()), nome)
+kpi_cols = st.columns(len(HOME_KPIS))
+for col, (nome, label, fmt_str) in zip(kpi_cols, HOME_KPIS):
+    df_k = _home_data.get(nome, pd.DataFrame())
+    with col:
+        if not df_k.empty:
+            v  = df_k["valor"].iloc[-1]
+            d2 = float(v - df_k["valor"].iloc[-2]) if len(df_k) >= 2 else None
+            kpi_card(label, fmt_str.format(v=fmt(v), u=SGS[nome].unidade),
+                     chg_p=d2, sub=f"Ref: {df_k['data'].iloc[-1].strftime('%b/%Y')}")
+        else:
+            kpi_card(label, "—", sub="BCB indisponível")
+
+st.markdown(
+    '<div class="sec-title">Histórico — 12 meses '
+    '<span style="font-size:10px;font-weight:400;color:#9ca3af;text-transform:none;'
+    'letter-spacing:0;margin-left:4px">→ análise completa em Monitor Inflação</span></div>',
+    unsafe_allow_html=True,
+)
+
+def _since(df, months):
+    if df.empty: return df
+    cutoff = df["data"].max() - pd.DateOffset(months=months)
+    return df[df["data"] >= cutoff].reset_index(drop=True)
+
+_chart_pairs = list(zip(HOME_CHARTS[::2], HOME_CHARTS[1::2]))
+for (nome_a, meses_a), (nome_b, meses_b) in _chart_pairs:
+    col_a, col_b = st.columns(2)
+    for col, nome, meses in [(col_a, nome_a, meses_a), (col_b, nome_b, meses_b)]:
+        s = SGS[nome]
+        cod, unit, freq, tipo, cor = s.codigo, s.unidade, s.frequencia, s.tipo, s.cor
+        df = _since(_home_data.get(nome, pd.DataFrame()), meses)
+        titulo = f"{nome} ({unit})"
+        with col:
+            if not df.empty:
+                fig = (bar_fig(df, titulo, suffix=f" {unit}")
+                       if tipo == "bar"
+                       else line_fig(df, titulo, cor, suffix=f" {unit}"))
+                render_chart(fig, nome.lower().replace(" ", "_"), static=True)
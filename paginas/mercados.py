@@ -0,0 +1,129 @@
+"""
+paginas/mercados.py — Mercados Globais: painel de cotações e histórico por ativo.
+Executada por st.navigation em app.py; só roda quando é a página ativa.
+"""
+import pandas as pd
+import streamlit as st
+
+from settings import (
+    logger, TZ_BRT, GLOBAL, MERCADOS_HIST, H_MEDIUM, COTACOES_INTERVALO, COTACOES_CHECAGEM,
+)
+from data import get_cotacoes, get_hist, recarregar
+from charts import line_fig
+from components import page_header, sec_title, render_chart, cronometro, abas
+
+page_header("Mercados Globais")
+st.markdown("""<style>
+.terminal-cat{font-size:9px;font-weight:800;color:#6b7280;text-transform:uppercase;
+  letter-spacing:2.5px;margin:0 0 8px 2px;display:block}
+.tile{border-radius:6px;padding:10px 12px 9px}
+.tile-name{font-size:9px;font-weight:800;color:rgba(255,255,255,.55);text-transform:uppercase;
+  letter-spacing:1.2px;margin-bottom:5px;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}
+.tile-price{font-size:20px;font-weight:700;color:#fff;line-height:1.1;margin-bottom:6px;white-space:nowrap}
+.tile-hl{font-size:9.5px;font-weight:500;display:flex;justify-content:space-between;margin-bottom:2px}
+.tile-chg{font-size:9.5px;font-weight:700;display:flex;justify-content:space-between}
+.up{background:#14522c} .dn{background:#7f1d1d} .neu{background:#1e2535}
+.up .tile-hl,.up .tile-chg{color:#86efac}
+.dn .tile-hl,.dn .tile-chg{color:#fca5a5}
+.neu .tile-hl,.neu .tile-chg{color:#94a3b8}
+.tile-closed{font-size:8px;background:rgba(0,0,0,.3);border-radius:3px;padding:1px 5px;
+  color:rgba(255,255,255,.45);margin-left:5px;font-weight:600;vertical-align:middle}
+</style>""", unsafe_allow_html=True)
+
+def _tfmt(v, unit):
+    if v is None: return "—"
+    if unit == "pts":
+        return f"{v:,.0f}".replace(",", ".") if v >= 10000 else \
+               f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"{v:,.{4 if unit == 'R$' else 2}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+def _tile(nome, d, unit):
+    p  = d.get("price")
+    cp = d.get("chg_p")
+    cv = d.get("chg_v")
+    dh = d.get("day_high")
+    dl = d.get("day_low")
+    cl = d.get("is_closed", False)
+    if p is None:
+        return (f"<div class='tile neu'>"
+                f"<div class='tile-name'>{nome}</div>"
+                f"<div class='tile-price' style='opacity:.4'>—</div></div>")
+    cls = "up" if (cp or 0) >= 0 else "dn"
+    arr = "▲" if (cp or 0) >= 0 else "▼"
+    px  = "R$ " if unit == "R$" else ("US$ " if "US$" in unit else "")
+    fec = "<span class='tile-closed'>FEC</span>" if cl else ""
+    return (
+        f"<div class='tile {cls}'>"
+        f"<div class='tile-name'>{nome}{fec}</div>"
+        f"<div class='tile-price'>{px}{_tfmt(p, unit)}</div>"
+        f"<div class='tile-hl'>"
+        f"<span>H {_tfmt(dh, unit) if dh else '—'}</span>"
+        f"<span>{('+' if cv >= 0 else '') + _tfmt(cv, unit) if cv is not None else '—'} {arr}</span>"
+        f"</div>"
+        f"<div class='tile-chg'>"
+        f"<span>L {_tfmt(dl, unit) if dl else '—'}</span>"
+        f"<span>{('+' if cp >= 0 else '') + f'{cp:.2f}%'.replace('.', ',') if cp is not None else '—'}</span>"
+        f"</div></div>"
+    )
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _tiles_html(versao: int, _quotes: dict) -> dict:
+    """HTML de todos os tiles de uma versão do snapshot — montado uma vez, não por sessão."""
+    return {nome: _tile(nome, _quotes.get(g.simbolo, {}), g.unidade) for nome, g in GLOBAL.items()}
+
+def _group(label, lst, tiles):
+    st.markdown(f"<span class='terminal-cat'>{label}</span>", unsafe_allow_html=True)
+    cols = st.columns(len(lst))
+    for col, nome in zip(cols, lst):
+        with col:
+            st.markdown(tiles[nome], unsafe_allow_html=True)
+    st.markdown("<div style='height:10px'></div>", unsafe_allow_html=True)
+
+# ── Fragment: lê o snapshot do poller do processo, nunca vai à rede ───────
+# A cada COTACOES_CHECAGEM s só compara a versão; com a mesma versão o HTML sai
+# do cache e o frontend não tem o que redesenhar.
+@st.fragment(run_every=COTACOES_CHECAGEM)
+def _cotacoes():
+    try:
+        cot   = get_cotacoes()
+        tiles = _tiles_html(cot.versao, cot.quotes)
+        _group("Índices", ["IBOVESPA", "S&P 500", "Nasdaq 100", "Dow Jones", "FTSE 100", "DAX"], tiles)
+        c_en, c_me = st.columns([2, 3])
+        with c_en: _group("Energia", ["Petróleo Brent", "Petróleo WTI"], tiles)
+        with c_me: _group("Metais",  ["Ouro", "Prata", "Cobre"], tiles)
+        c_fx, c_cr = st.columns([2, 2])
+        with c_fx: _group("Câmbio", ["Dólar (USD/BRL)", "Euro (EUR/BRL)"], tiles)
+        with c_cr: _group("Cripto", ["Bitcoin", "Ethereum"], tiles)
+        atualizado = cot.obtido.astimezone(TZ_BRT).strftime("%d/%m/%Y %H:%M:%S") if cot.obtido else "—"
+        st.markdown(
+            f"<div style='text-align:right;font-size:10px;color:#6b7280;margin-top:4px'>"
+            f"Atualizado: {atualizado} BRT &nbsp;·&nbsp; ↻ {COTACOES_INTERVALO // 60}min</div>",
+            unsafe_allow_html=True,
+        )
+    except Exception as e:
+        logger.error("Mercados: %s", e)
+        st.error("⚠️ Erro ao carregar cotações.")
+        st.button("↺ Tentar novamente", on_click=recarregar, args=("cotacoes",))
+
+_cotacoes()
+
+# ── Histórico: fragment próprio, não pisca com o refresh das cotações ─────
+# Abas preguiçosas: só o ativo selecionado chama get_hist (1 request Yahoo, não 6)
+@st.fragment
+def _historico():
+    with cronometro("Mercados/Histórico"):
+        sec_title("Histórico Interativo", "2 anos", "badge-daily")
+        nome_h = abas({nome: () for nome in MERCADOS_HIST}, key="mercados_hist",
+                      padrao=st.session_state.mercados_ativo)
+        g_h = GLOBAL[nome_h]
+        dfh = get_hist(g_h.simbolo, 2)
+        if not dfh.empty:
+            _xmax_h = dfh["data"].max()
+            _xmin_h = _xmax_h - pd.DateOffset(years=2)
+            fig_h = line_fig(dfh, f"{nome_h} — 2 anos", g_h.cor,
+                             suffix=f" {g_h.unidade}", height=H_MEDIUM,
+                             inter=True, x_ini=_xmin_h, x_fim=_xmax_h)
+            render_chart(fig_h, nome_h)
+
+st.markdown("<div style='height:12px'></div>", unsafe_allow_html=True)
+_historico()
@@ -0,0 +1,310 @@
+"""
+paginas/monitor.py — Monitor Inflação: IPCA, núcleos, grupos e meta do BCB.
+Executada por st.navigation em app.py; só roda quando é a página ativa.
+"""
+import pandas as pd
+from datetime import datetime
+import streamlit as st
+
+from settings import logger, NUCLEO_SGS, IPCA_GRUPOS_IDS, BCB_META, BCB_TOLE, H_LARGE, H_XLARGE
+from data import (
+    get_bcb_many, get_ipca_grupos, get_ipca_acum_grupo, alinhar_series, transformar_matriz,
+    ultimas_observacoes, recarregar,
+)
+from charts import (
+    cores_overlay_fig, acum12m_meta_fig, grupos_bar_fig, grupos_linhas_fig,
+    nucleos_acum12m_fig, grupos_acum12m_fig,
+)
+from components import fmt, page_header, sec_title, kpi_card, stale_banner, render_chart, cronometro
+
+_GRUPO_IDS = [g.strip() for g in IPCA_GRUPOS_IDS.split(",")]
+
+# Fragment com os dados já carregados como entrada: mudar g_ini/g_fim refaz só
+# esta seção (gráficos de grupos + CSVs), sem recalcular núcleos e IPCA.
+@st.fragment
+def _secao_grupos(df_grupos_mensal, df_grupos_acum, meta_bcb):
+    """IPCA por grupos (SIDRA): janela g_ini/g_fim, destaques, acumulado 12M e CSVs."""
+    with cronometro("Monitor/Grupos"):
+        sec_title("IPCA por Grupos — IBGE SIDRA", "↻ diário", "badge-daily")
+        if df_grupos_mensal.empty:
+            st.warning("⚠️ API IBGE/SIDRA temporariamente indisponível.")
+        else:
+            datas_disp = sorted(df_grupos_mensal["data"].unique())
+            dmin_g = datas_disp[0].date()
+            dmax_g = datas_disp[-1].date()
+            _d24g  = datas_disp[-24].date() if len(datas_disp) >= 24 else dmin_g
+            st.markdown(
+                f"<div style='font-size:11px;color:#6b7280;margin:0 0 12px'>"
+                f"Disponível: <strong>{dmin_g.strftime('%b/%Y')}</strong> → "
+                f"<strong>{dmax_g.strftime('%b/%Y')}</strong> · {len(datas_disp)} meses · "
+                f"<em>Série completa carregada</em></div>",
+                unsafe_allow_html=True,
+            )
+            cg1, cg2 = st.columns(2)
+            with cg1: g_ini = st.date_input("Exibir de",  value=_d24g,  min_value=dmin_g, max_value=dmax_g, key="g_ini")
+            with cg2: g_fim = st.date_input("Exibir até", value=dmax_g, min_value=dmin_g, max_value=dmax_g, key="g_fim")
+            ultimo_mes = df_grupos_mensal[df_grupos_mensal["data"] <= pd.Timestamp(g_fim)]["data"].max()
+            if pd.isna(ultimo_mes):
+                st.warning("Nenhum dado no intervalo selecionado.")
+            else:
+                st.success(f"✅ Exibindo {g_ini.strftime('%b/%Y')} → {g_fim.strftime('%b/%Y')} · Ref: {ultimo_mes.strftime('%b/%Y')}")
+                df_ult = (df_grupos_mensal[
+                    (df_grupos_mensal["data"] == ultimo_mes) &
+                    df_grupos_mensal["grupo_id"].isin(_GRUPO_IDS)
+                ].copy().sort_values("valor", ascending=False))
+
+                def _mini_card(grupo, valor):
+                    cor  = "#dc2626" if valor >= 0 else "#16a34a"
+                    sinal = "▲" if valor >= 0 else "▼"
+                    st.markdown(
+                        f"<div style='background:#fff;border:1px solid #e2e5e9;border-radius:10px;"
+                        f"padding:10px 14px;margin-bottom:8px;display:flex;align-items:center;"
+                        f"justify-content:space-between'>"
+                        f"<span style='font-size:12px;font-weight:500;color:#374151'>{grupo}</span>"
+                        f"<span style='font-size:14px;font-weight:700;color:{cor}'>"
+                        f"{sinal} {abs(valor):.2f}%</span></div>",
+                        unsafe_allow_html=True,
+                    )
+
+                ga, gb = st.columns([1.2, 1])
+                with ga:
+                    render_chart(grupos_bar_fig(df_grupos_mensal, ultimo_mes), "ipca_grupos_mensal", static=True)
+                with gb:
+                    st.markdown(
+                        f"<div style='font-size:10px;font-weight:700;color:#6b7280;"
+                        f"text-transform:uppercase;letter-spacing:1.5px;margin-bottom:8px'>"
+                        f"Maiores altas — {ultimo_mes.strftime('%b/%Y')}</div>",
+                        unsafe_allow_html=True,
+                    )
+                    for _, row in df_ult.head(3).iterrows():
+                        _mini_card(row["grupo"], row["valor"])
+                    st.markdown(
+                        f"<div style='font-size:10px;font-weight:700;color:#6b7280;"
+                        f"text-transform:uppercase;letter-spacing:1.5px;margin:14px 0 8px'>"
+                        f"Menores variações — {ultimo_mes.strftime('%b/%Y')}</div>",
+                        unsafe_allow_html=True,
+                    )
+                    for _, row in df_ult.tail(3).iterrows():
+                        _mini_card(row["grupo"], row["valor"])
+
+                st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
+                render_chart(
+                    grupos_linhas_fig(df_grupos_mensal, d_ini=g_ini, d_fim=g_fim, height=H_LARGE),
+                    "ipca_grupos_evolucao",
+                )
+
+                if not df_grupos_acum.empty:
+                    st.markdown("<div style='height:4px'></div>", unsafe_allow_html=True)
+                    sec_title("Acumulado 12 Meses por Grupo — IBGE", "↻ diário", "badge-daily")
+                    ult_acum  = df_grupos_acum[df_grupos_acum["data"] <= pd.Timestamp(g_fim)]["data"].max()
+                    df_acum_u = (df_grupos_acum[
+                        (df_grupos_acum["data"] == ult_acum) &
+                        df_grupos_acum["grupo_id"].isin(_GRUPO_IDS)
+                    ].copy().sort_values("valor", ascending=True))
+                    if not df_acum_u.empty:
+                        render_chart(grupos_acum12m_fig(df_acum_u, ult_acum, meta_bcb),
+                                     "ipca_grupos_acum12m", static=True)
+
+                st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
+                dlo_g = df_grupos_mensal[
+                    (df_grupos_mensal["data"] >= pd.Timestamp(g_ini)) &
+                    (df_grupos_mensal["data"] <= pd.Timestamp(g_fim))
+                ].copy()
+                dlo_g["data"] = dlo_g["data"].dt.strftime("%Y-%m")
+                col_dl1, col_dl2 = st.columns(2)
+                with col_dl1:
+                    st.download_button(
+                        f"💾 Baixar CSV — var. mensal por grupo ({len(dlo_g)} linhas)",
+                        data=dlo_g.to_csv(index=False).encode("utf-8-sig"),
+                        file_name="ipca_grupos_mensal.csv", mime="text/csv",
+                    )
+                with col_dl2:
+                    if not df_grupos_acum.empty:
+                        dlo_acum = df_grupos_acum[
+                            (df_grupos_acum["data"] >= pd.Timestamp(g_ini)) &
+                            (df_grupos_acum["data"] <= pd.Timestamp(g_fim))
+                        ].copy()
+                        dlo_acum["data"] = dlo_acum["data"].dt.strftime("%Y-%m")
+                        st.download_button(
+                            f"💾 Baixar CSV — acum. 12M por grupo ({len(dlo_acum)} linhas)",
+                            data=dlo_acum.to_csv(index=False).encode("utf-8-sig"),
+                            file_name="ipca_grupos_acum12m.csv", mime="text/csv",
+                        )
+
+
+page_header("Monitor de Inflação")
+try:
+    with st.spinner("Carregando indicadores de inflação..."):
+        _infl_raw        = get_bcb_many([433] + [n.codigo for n in NUCLEO_SGS.values()])
+        df_ipca_full     = _infl_raw[433]
+        nucleo_data      = {key: (_infl_raw[n.codigo], n.descricao, n.cor) for key, n in NUCLEO_SGS.items()}
+        df_grupos_mensal = get_ipca_grupos(60)
+        df_grupos_acum   = get_ipca_acum_grupo(60)
+except Exception as e:
+    logger.error("Monitor Inflação: %s", e)
+    st.error("⚠️ Erro ao carregar dados de inflação.")
+    st.button("↺ Tentar novamente", on_click=recarregar, args=("sgs", "sidra"))
+    st.stop()
+
+hoje_ano  = datetime.today().year
+meta_bcb  = BCB_META.get(hoje_ano, 3.0)
+teto_meta = meta_bcb + BCB_TOLE
+piso_meta = meta_bcb - BCB_TOLE
+
+sec_title("IPCA — Inflação ao Consumidor", "↻ diário", "badge-daily")
+stale_banner(df_ipca_full, "IPCA")
+ipca_mensal  = df_ipca_full["valor"].iloc[-1]       if not df_ipca_full.empty else None
+ipca_ant     = df_ipca_full["valor"].iloc[-2]       if len(df_ipca_full) >= 2  else None
+ipca_acum12m = df_ipca_full["valor"].tail(12).sum() if len(df_ipca_full) >= 12 else None
+ref_mes      = df_ipca_full["data"].iloc[-1].strftime("%b/%Y") if not df_ipca_full.empty else ""
+desvio_meta  = (ipca_acum12m - meta_bcb) if ipca_acum12m is not None else None
+var_mensal   = (ipca_mensal - ipca_ant)  if (ipca_mensal is not None and ipca_ant is not None) else None
+
+c1, c2, c3, c4 = st.columns(4)
+with c1:
+    kpi_card("IPCA Mensal", f"{fmt(ipca_mensal)}%" if ipca_mensal is not None else "—",
+             chg_p=var_mensal, raw_delta=var_mensal, sub=f"Ref: {ref_mes}")
+with c2:
+    if ipca_acum12m is not None:
+        status = ("✓ dentro da meta" if piso_meta <= ipca_acum12m <= teto_meta
+                  else ("↑ acima do teto" if ipca_acum12m > teto_meta else "↓ abaixo do piso"))
+        kpi_card("Acum. 12 Meses", f"{fmt(ipca_acum12m)}%", sub=status)
+    else:
+        kpi_card("Acum. 12 Meses", "—")
+with c3:
+    kpi_card("Meta BCB", f"{fmt(meta_bcb, 1)}%",
+             sub=f"Banda: {fmt(piso_meta, 1)}% – {fmt(teto_meta, 1)}% (±{BCB_TOLE}pp)")
+with c4:
+    if desvio_meta is not None:
+        kpi_card("Desvio da Meta",
+                 f"{'+' if desvio_meta >= 0 else ''}{fmt(desvio_meta)}pp",
+                 chg_p=desvio_meta, raw_delta=desvio_meta,
+                 sub=f"Meta contínua {hoje_ano}")
+    else:
+        kpi_card("Desvio da Meta", "—")
+
+st.markdown("<div style='height:4px'></div>", unsafe_allow_html=True)
+sec_title("Núcleos de Inflação — BCB", "↻ diário", "badge-daily")
+st.markdown(
+    "<div style='font-size:11px;color:#6b7280;margin:0 0 14px'>"
+    "Cinco medidas calculadas pelo BCB: "
+    "<b>MA-S</b> (4466) · <b>MA</b> (11426) · <b>DP</b> (4467) · "
+    "<b>EX</b> (11427) · <b>P55</b> (28750)</div>",
+    unsafe_allow_html=True,
+)
+
+_xmax = df_ipca_full["data"].max() if not df_ipca_full.empty else None
+_xmin = (_xmax - pd.DateOffset(months=24)) if _xmax is not None else None
+fig_cores = cores_overlay_fig(df_ipca_full, nucleo_data, height=H_XLARGE, x_ini=_xmin, x_fim=_xmax)
+render_chart(fig_cores, "ipca_nucleos")
+
+# IPCA + núcleos alinhados numa matriz só — tabela e média saem dela
+_mat_infl = alinhar_series({"IPCA": df_ipca_full,
+                            **{key: df_n for key, (df_n, _, _) in nucleo_data.items()}})
+_ult_infl = ultimas_observacoes(_mat_infl) if not _mat_infl.empty else pd.DataFrame()
+_medidas  = [("IPCA", "IPCA (headline)", 433)] + [
+    (key, f"{key} — {label}", NUCLEO_SGS[key].codigo) for key, (_, label, _) in nucleo_data.items()
+]
+tab_rows = []
+for key, medida, cod in _medidas:
+    if key in _ult_infl.index:
+        ul = _ult_infl.loc[key]
+        an = ul["anterior"] if pd.notna(ul["anterior"]) else None
+        tab_rows.append({
+            "Medida": medida, "Cód. SGS": cod,
+            "Último valor": f"{fmt(ul['valor'])}%",
+            "Ref.": ul["data"].strftime("%b/%Y"),
+            "Var. s/ ant.": f"{'+' if an and ul['valor'] >= an else ''}{fmt(ul['valor'] - an)}pp" if an else "—",
+        })
+if tab_rows:
+    st.dataframe(pd.DataFrame(tab_rows), hide_index=True, use_container_width=True,
+                 height=46 + len(tab_rows) * 35)
+    _dl_cols = st.columns(len(nucleo_data) + 1)
+    with _dl_cols[0]:
+        if not df_ipca_full.empty:
+            _dlo_ipca = df_ipca_full.copy()
+            _dlo_ipca["data"] = _dlo_ipca["data"].dt.strftime("%d/%m/%Y")
+            st.download_button("💾 IPCA",
+                data=_dlo_ipca.to_csv(index=False).encode("utf-8-sig"),
+                file_name="ipca.csv", mime="text/csv", use_container_width=True)
+    for i, (key, (df_n, label, _)) in enumerate(nucleo_data.items()):
+        with _dl_cols[i + 1]:
+            if not df_n.empty:
+                _dlo_n = df_n.copy()
+                _dlo_n["data"] = _dlo_n["data"].dt.strftime("%d/%m/%Y")
+                st.download_button(f"💾 {key}",
+                    data=_dlo_n.to_csv(index=False).encode("utf-8-sig"),
+                    file_name=f"nucleo_{key.lower()}.csv", mime="text/csv",
+                    use_container_width=True)
+
+st.markdown("<div style='height:4px'></div>", unsafe_allow_html=True)
+sec_title("Média dos Núcleos — Acumulado 12 Meses", "↻ diário", "badge-daily")
+# Acumulado 12M de IPCA e de todos os núcleos numa passada vetorizada
+_a12, _ = transformar_matriz(_mat_infl, "Acumulado 12M")
+_nucl_a12 = _a12[[k for k in NUCLEO_SGS if k in _a12.columns]].dropna(how="all")
+if not _nucl_a12.empty:
+    _xmax_m = _nucl_a12.index.max()
+    _xmin_m = _xmax_m - pd.DateOffset(months=24)
+    fig_media = nucleos_acum12m_fig(_a12, nucleo_data, meta_bcb, x_ini=_xmin_m, x_fim=_xmax_m)
+    render_chart(fig_media, "nucleos_acum12m")
+
+st.markdown("<div style='height:4px'></div>", unsafe_allow_html=True)
+sec_title("Acumulado 12 Meses vs Meta BCB", "↻ diário", "badge-daily")
+if not df_ipca_full.empty:
+    _xmax_a = df_ipca_full["data"].max()
+    _xmin_a = _xmax_a - pd.DateOffset(months=24)
+    fig_acum = acum12m_meta_fig(df_ipca_full, meta_val=meta_bcb, x_ini=_xmin_a, x_fim=_xmax_a)
+    render_chart(fig_acum, "ipca_acum12m_meta")
+
+st.markdown("<div style='height:4px'></div>", unsafe_allow_html=True)
+_secao_grupos(df_grupos_mensal, df_grupos_acum, meta_bcb)
+
+st.markdown("<div style='height:16px'></div>", unsafe_allow_html=True)
+sec_title("Metodologia dos Núcleos de Inflação — BCB", "", "badge-daily")
+st.markdown("""
+<div style='background:#fff;border:1px solid #e2e5e9;border-radius:12px;padding:20px 24px;
+font-size:12px;color:#374151;line-height:1.8'>
+<p style='margin:0 0 12px'>Os núcleos capturam a <strong>tendência subjacente da inflação</strong>,
+removendo componentes voláteis. O BCB publica cinco medidas no <em>Relatório de Inflação</em>:</p>
+<table style='width:100%;border-collapse:collapse;font-size:11.5px'>
+<thead><tr style='border-bottom:2px solid #e2e5e9'>
+<th style='text-align:left;padding:6px 10px;color:#6b7280;font-size:10px;text-transform:uppercase'>Sigla</th>
+<th style='text-align:left;padding:6px 10px;color:#6b7280;font-size:10px;text-transform:uppercase'>Nome</th>
+<th style='text-align:left;padding:6px 10px;color:#6b7280;font-size:10px;text-transform:uppercase'>SGS</th>
+<th style='text-align:left;padding:6px 10px;color:#6b7280;font-size:10px;text-transform:uppercase'>Como é calculado</th>
+</tr></thead><tbody>
+<tr style='border-bottom:1px solid #f1f5f9'>
+  <td style='padding:8px 10px;font-weight:700;color:#0891b2'>MA-S</td>
+  <td style='padding:8px 10px'>Médias Aparadas c/ Suavização</td>
+  <td style='padding:8px 10px;color:#6b7280'>4466</td>
+  <td style='padding:8px 10px'>Apara 20% dos extremos e suaviza monitorados/sazonais ao longo de 12 meses. Mais usada pelo Copom.</td>
+</tr>
+<tr style='border-bottom:1px solid #f1f5f9'>
+  <td style='padding:8px 10px;font-weight:700;color:#06b6d4'>MA</td>
+  <td style='padding:8px 10px'>Médias Aparadas s/ Suavização</td>
+  <td style='padding:8px 10px;color:#6b7280'>11426</td>
+  <td style='padding:8px 10px'>Igual ao MA-S sem suavização. Mais sensível a choques pontuais.</td>
+</tr>
+<tr style='border-bottom:1px solid #f1f5f9'>
+  <td style='padding:8px 10px;font-weight:700;color:#16a34a'>DP</td>
+  <td style='padding:8px 10px'>Dupla Ponderação</td>
+  <td style='padding:8px 10px;color:#6b7280'>4467</td>
+  <td style='padding:8px 10px'>Repesa cada item pela inversa da volatilidade histórica. Itens mais voláteis recebem peso menor.</td>
+</tr>
+<tr style='border-bottom:1px solid #f1f5f9'>
+  <td style='padding:8px 10px;font-weight:700;color:#d97706'>EX</td>
+  <td style='padding:8px 10px'>Exclusão</td>
+  <td style='padding:8px 10px;color:#6b7280'>11427</td>
+  <td style='padding:8px 10px'>Exclui alimentação no domicílio e administrados. Mede a inflação de mercado livre.</td>
+</tr>
+<tr>
+  <td style='padding:8px 10px;font-weight:700;color:#7c3aed'>P55</td>
+  <td style='padding:8px 10px'>Percentil 55</td>
+  <td style='padding:8px 10px;color:#6b7280'>28750</td>
+  <td style='padding:8px 10px'>Usa o percentil 55 da distribuição ponderada. Robusto a outliers sem regras de exclusão.</td>
+</tr>
+</tbody></table>
+<p style='margin:14px 0 0;font-size:11px;color:#9ca3af'>Fonte: BCB/SGS. Variação mensal e acumulado 12 meses.
+Atualização mensal após divulgação do IPCA pelo IBGE.</p>
+</div>""", unsafe_allow_html=True)
+st.markdown("<div style='height:8px'></div>", unsafe_allow_html=True)
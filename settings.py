@@ -2,6 +2,7 @@
 settings.py — Constantes, TTLs e configuração declarativa do dashboard.
 Nenhuma dependência de Streamlit ou lógica de negócio aqui.
 """
+import os
 import logging
 from zoneinfo import ZoneInfo
 from typing import NamedTuple
@@ -18,10 +19,84 @@ logging.basicConfig(
 logger = logging.getLogger("eqi_dash")
 
 # ── TTL de cache por tipo de fonte ────────────────────────────────────────────
-TTL_MERCADOS = 60        # cotações Yahoo Finance: 1 minuto
+TTL_MERCADOS = 900       # cotações Yahoo fora de GLOBAL: 15 minutos (GLOBAL vem do poller)
 TTL_BCB      = 3_600     # séries BCB/SGS: 1 hora
 TTL_IBGE     = 86_400    # grupos IPCA IBGE (mensal): 24 horas
 TTL_HIST     = 3_600     # histórico Yahoo Finance: 1 hora
+SWR_RETRY    = 60        # intervalo mínimo entre revalidações após falha do upstream
+
+# Scheduler de aquecimento: a cada tick, renova o que estiver a menos de
+# MARGEM×TTL de expirar (ex.: BCB 1h → renovado aos 54min)
+AQUECIMENTO_TICK   = 60
+AQUECIMENTO_MARGEM = 0.10
+
+# ── Armazenamento local (SQLite) ──────────────────────────────────────────────
+# Séries já baixadas ficam em disco e sobrevivem a restarts; cada refresh só
+# pede ao upstream o trecho posterior ao último dado gravado.
+STORE_PATH = os.environ.get(
+    "EQI_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "eqi_store.sqlite"),
+)
+# Janela relida a cada refresh incremental do SGS — captura revisões recentes
+# (PIB, IBC-Br, núcleos) sem baixar a série inteira de novo
+SGS_RELEITURA_DIAS = 400
+# Histórico Yahoo: janela baixada uma vez por símbolo (janelas menores são
+# fatias dela) e dias relidos a cada extensão incremental (último pregão)
+YF_HIST_ANOS           = 10
+YF_HIST_RELEITURA_DIAS = 5
+
+# ── Concorrência por host ─────────────────────────────────────────────────────
+# Máximo de requests simultâneos ao api.bcb.gov.br (get_bcb_many e páginas)
+BCB_MAX_CONEXOES = 4
+
+# ── Pool HTTP (net.py) ────────────────────────────────────────────────────────
+HTTP_POOL_MAXSIZE = 10     # conexões keep-alive mantidas por host
+HTTP_RETRIES      = 2      # retries do adapter (conexão, leitura, 429/5xx)
+HTTP_BACKOFF      = 0.5    # backoff exponencial: 0.5s, 1s, ...
+
+# ── Rate limit por upstream (net.py) ──────────────────────────────────────────
+# Token bucket AIMD por host, compartilhado por todas as sessões do processo:
+# cada resposta OK soma LIMITE_AUMENTO req/s à taxa (até o teto); cada 429 a
+# multiplica por LIMITE_CORTE (até o piso). A chave casa o host ou seus subdomínios
+# ("yahoo.com" cobre query1/query2.finance e o handshake em fc.yahoo.com).
+#                               taxa ini.  rajada  piso   teto   (req/s)
+LIMITES_HOST = {
+    "yahoo.com":                (2.0,      4,      0.2,   5.0),
+    "api.bcb.gov.br":           (4.0,      8,      0.5,   10.0),
+    "olinda.bcb.gov.br":        (2.0,      4,      0.25,  5.0),
+    "servicodados.ibge.gov.br": (2.0,      4,      0.25,  5.0),
+}
+LIMITE_AUMENTO   = 0.1     # additive increase por sucesso (req/s)
+LIMITE_CORTE     = 0.5     # multiplicative decrease por 429
+LIMITE_JANELA    = 1.0     # no máximo um corte por janela (s) — rajada de 429 conta uma vez
+LIMITE_PAUSA_MAX = 30.0    # teto do Retry-After respeitado pelo bucket (s)
+
+# ── Circuit breaker por upstream (net.py) ─────────────────────────────────────
+# Após DISJUNTOR_FALHAS falhas seguidas (conexão, timeout, 5xx) o circuito do
+# host abre: requests falham na hora e o SWR segue servindo o último dado bom.
+# Uma sonda em background a cada DISJUNTOR_ESPERA s decide quando fechar.
+DISJUNTOR_FALHAS        = 3
+DISJUNTOR_ESPERA        = 30     # s entre sondas com o circuito aberto
+DISJUNTOR_SONDA_TIMEOUT = 5      # timeout da sonda (s)
+
+# ── Yahoo Finance — cotações em lote ──────────────────────────────────────────
+YF_LOTE          = 10      # símbolos por request do endpoint spark (máx. 20)
+YF_MAX_CONEXOES  = 2       # lotes em paralelo
+YF_CRUMB_TTL     = 3_000   # validade do par cookie+crumb antes de renovar (s)
+YF_CRUMB_ESPERA  = 60      # após handshake falho, get() falha na hora por este tempo (s)
+# Cookie jar em disco — o handshake fc.yahoo.com sobrevive a restarts.
+# EQI_YF_COOKIE_JAR="" desativa a persistência.
+YF_COOKIE_JAR = os.environ.get(
+    "EQI_YF_COOKIE_JAR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "yahoo_cookies.lwp"),
+)
+
+# ── Cotações — poller único por processo ──────────────────────────────────────
+# Uma thread renova o snapshot de GLOBAL e publica uma versão nova quando algo
+# muda; os fragments só consultam a versão (sem rede) e redesenham se mudou.
+COTACOES_INTERVALO = 60    # período do poller (s) — 2 requests spark/min, independente de sessões
+COTACOES_CHECAGEM  = 10    # run_every dos fragments que leem o snapshot (s)
+COTACOES_ESPERA    = 5     # prazo (desde a subida do poller) para a 1ª publicação; depois, "—" sem esperar (s)
 
 # ── URLs das APIs ─────────────────────────────────────────────────────────────
 BCB_BASE   = "https://api.bcb.gov.br/dados/serie/bcdata.sgs.{c}/dados"
@@ -47,6 +122,12 @@ CHART_CFG = {
     "responsive":               True,
 }
 CHART_CFG_INT = CHART_CFG  # alias de compatibilidade
+# Figuras prontas mantidas em memória (charts.py), compartilhadas entre sessões
+FIG_CACHE_MAX = 128
+# Orçamento de pontos por traço de linha (downsampling LTTB em charts.py):
+# ~1 ponto por pixel de um gráfico em largura total (~1000px); acima disso o
+# navegador não desenha diferença. None desativa.
+LTTB_PONTOS = 1000
 
 # ── Transformações disponíveis por série (períodos) ───────────────────────────
 # Constantes de string para evitar repetição literal em app.py
@@ -250,6 +331,9 @@ GLOBAL_DESCRICAO = {
 # ── Focus API (BCB/Expectativas) ──────────────────────────────────────────────
 FOCUS_BASE = "https://olinda.bcb.gov.br/olinda/servico/Expectativas/versao/v1/odata"
 TTL_FOCUS  = 86_400  # 24h — divulgado semanalmente
+# Paginação OData: $count na 1ª página, demais páginas ($skip) em paralelo
+FOCUS_PAGINA       = 10_000
+FOCUS_MAX_CONEXOES = 4
 
 # Indicadores disponíveis na API Focus
 FOCUS_INDICADORES = [
@@ -267,6 +351,8 @@ FOCUS_INDICADORES = [
     "Produção industrial",
     "Selic",
 ]
+# Indicadores com série "Próximos 12 meses" (endpoint ExpectativasMercadoInflacao12Meses)
+FOCUS_INDICADORES_12M = {"IPCA", "IPCA-15", "IGP-M", "IGP-DI", "IPC-Fipe"}
 
 # ── Navegação ─────────────────────────────────────────────────────────────────
 NAV = ["Início", "Monitor Inflação", "Expectativas", "Mercados Globais", "Gráficos", "Exportar"]
@@ -278,3 +364,12 @@ NAV_SLUGS = {
     "Expectativas":     "expectativas",
     "Exportar":         "exportar",
 }
+# Módulo de cada página em paginas/ (st.Page em app.py)
+NAV_ARQUIVOS = {
+    "Início":           "inicio",
+    "Monitor Inflação": "monitor",
+    "Mercados Globais": "mercados",
+    "Gráficos":         "graficos",
+    "Expectativas":     "expectativas",
+    "Exportar":         "exportar",
+}
@@ -0,0 +1,212 @@
+"""
+store.py — Armazenamento local (SQLite) das séries já baixadas.
+Persiste entre restarts do processo: depois do backfill inicial, data.py só
+pede ao upstream o trecho novo de cada série e grava aqui.
+Nenhuma dependência de Streamlit aqui. Falhas de disco nunca derrubam a página —
+são logadas e tratadas como "nada armazenado".
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from settings import logger, STORE_PATH
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sgs (
+    codigo INTEGER NOT NULL,
+    data   TEXT    NOT NULL,   -- ISO YYYY-MM-DD
+    valor  REAL    NOT NULL,
+    PRIMARY KEY (codigo, data)
+) WITHOUT ROWID;
+
+-- Histórico diário Yahoo (fechamento), data = pregão no fuso da bolsa
+CREATE TABLE IF NOT EXISTS yf_hist (
+    simbolo TEXT NOT NULL,
+    data    TEXT NOT NULL,   -- ISO YYYY-MM-DD
+    valor   REAL NOT NULL,
+    PRIMARY KEY (simbolo, data)
+) WITHOUT ROWID;
+
+-- Focus: ref distingue linhas da mesma data (DataReferencia nas anuais,
+-- Suavizada na série 12 meses)
+CREATE TABLE IF NOT EXISTS focus (
+    serie     TEXT NOT NULL,   -- 'anual' | '12m'
+    indicador TEXT NOT NULL,
+    data      TEXT NOT NULL,   -- ISO YYYY-MM-DD
+    ref       TEXT NOT NULL,
+    mediana   REAL,
+    minimo    REAL,
+    maximo    REAL,
+    desvio    REAL,
+    PRIMARY KEY (serie, indicador, data, ref)
+) WITHOUT ROWID;
+
+-- Início da janela já baixada por (serie, indicador): o store pode não ter
+-- linhas exatamente na data pedida, então a cobertura é guardada à parte
+CREATE TABLE IF NOT EXISTS focus_cobertura (
+    serie     TEXT NOT NULL,
+    indicador TEXT NOT NULL,
+    desde     TEXT NOT NULL,
+    PRIMARY KEY (serie, indicador)
+) WITHOUT ROWID;
+"""
+
+# sqlite serializa escritas por arquivo; o lock evita "database is locked"
+# entre threads do próprio processo (sessões Streamlit concorrentes)
+_WRITE_LOCK = threading.Lock()
+_init_done  = False
+
+
+@contextmanager
+def _connect():
+    global _init_done
+    os.makedirs(os.path.dirname(STORE_PATH) or ".", exist_ok=True)
+    con = sqlite3.connect(STORE_PATH, timeout=30)
+    try:
+        if not _init_done:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(_SCHEMA)
+            _init_done = True
+        yield con
+        con.commit()
+    finally:
+        con.close()
+
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame(columns=["data", "valor"])
+
+
+# ─── BCB/SGS ─────────────────────────────────────────────────────────────────
+def load_sgs(codigo: int) -> pd.DataFrame:
+    """Série SGS gravada em disco, ordenada por data. Vazia se nunca baixada."""
+    try:
+        with _connect() as con:
+            rows = con.execute(
+                "SELECT data, valor FROM sgs WHERE codigo = ? ORDER BY data", (int(codigo),)
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.warning("store: leitura SGS %s falhou: %s", codigo, e)
+        return _empty()
+    if not rows:
+        return _empty()
+    df = pd.DataFrame(rows, columns=["data", "valor"])
+    df["data"] = pd.to_datetime(df["data"], format="%Y-%m-%d")
+    return df
+
+
+def save_sgs(codigo: int, df: pd.DataFrame) -> None:
+    """Upsert das linhas [data, valor] — datas já gravadas são sobrescritas (revisões)."""
+    if df.empty:
+        return
+    rows = list(zip(
+        [int(codigo)] * len(df),
+        df["data"].dt.strftime("%Y-%m-%d"),
+        df["valor"].astype(float),
+    ))
+    try:
+        with _WRITE_LOCK, _connect() as con:
+            con.executemany("INSERT OR REPLACE INTO sgs (codigo, data, valor) VALUES (?, ?, ?)", rows)
+    except sqlite3.Error as e:
+        logger.warning("store: gravação SGS %s falhou: %s", codigo, e)
+
+
+# ─── YAHOO/HISTÓRICO ─────────────────────────────────────────────────────────
+def load_yf_hist(simbolo: str) -> pd.DataFrame:
+    """Fechamentos diários gravados do símbolo, ordenados por data. Vazio se nunca baixado."""
+    try:
+        with _connect() as con:
+            rows = con.execute(
+                "SELECT data, valor FROM yf_hist WHERE simbolo = ? ORDER BY data", (simbolo,)
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.warning("store: leitura histórico %s falhou: %s", simbolo, e)
+        return _empty()
+    if not rows:
+        return _empty()
+    df = pd.DataFrame(rows, columns=["data", "valor"])
+    df["data"] = pd.to_datetime(df["data"], format="%Y-%m-%d")
+    return df
+
+
+def save_yf_hist(simbolo: str, df: pd.DataFrame) -> None:
+    """Upsert por pregão — o candle do dia corrente é sobrescrito a cada extensão."""
+    if df.empty:
+        return
+    rows = list(zip([simbolo] * len(df), df["data"].dt.strftime("%Y-%m-%d"), df["valor"].astype(float)))
+    try:
+        with _WRITE_LOCK, _connect() as con:
+            con.executemany("INSERT OR REPLACE INTO yf_hist (simbolo, data, valor) VALUES (?, ?, ?)", rows)
+    except sqlite3.Error as e:
+        logger.warning("store: gravação histórico %s falhou: %s", simbolo, e)
+
+
+# ─── BCB/FOCUS ───────────────────────────────────────────────────────────────
+_FOCUS_COLS = ["indicador", "data", "ref", "mediana", "minimo", "maximo", "desvio"]
+
+def _marcadores(n: int) -> str:
+    return ",".join("?" * n)
+
+def load_focus(serie: str, indicadores, desde: str) -> pd.DataFrame:
+    """Linhas Focus gravadas com data >= desde (ISO), ordenadas por indicador, data e ref."""
+    indicadores = list(indicadores)
+    try:
+        with _connect() as con:
+            rows = con.execute(
+                "SELECT indicador, data, ref, mediana, minimo, maximo, desvio FROM focus "
+                f"WHERE serie = ? AND indicador IN ({_marcadores(len(indicadores))}) AND data >= ? "
+                "ORDER BY indicador, data, ref",
+                (serie, *indicadores, desde),
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.warning("store: leitura Focus %s falhou: %s", serie, e)
+        return pd.DataFrame(columns=_FOCUS_COLS)
+    df = pd.DataFrame(rows, columns=_FOCUS_COLS)
+    df["data"] = pd.to_datetime(df["data"], format="%Y-%m-%d")
+    return df
+
+def focus_estado(serie: str, indicadores) -> tuple:
+    """
+    (desde, última data) já gravados para o conjunto de indicadores.
+    desde = None se algum deles nunca foi baixado (a janela precisa de backfill).
+    """
+    indicadores = list(indicadores)
+    try:
+        with _connect() as con:
+            cob = con.execute(
+                f"SELECT COUNT(*), MAX(desde) FROM focus_cobertura "
+                f"WHERE serie = ? AND indicador IN ({_marcadores(len(indicadores))})",
+                (serie, *indicadores),
+            ).fetchone()
+            ult = con.execute(
+                f"SELECT MAX(data) FROM focus "
+                f"WHERE serie = ? AND indicador IN ({_marcadores(len(indicadores))})",
+                (serie, *indicadores),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("store: estado Focus %s falhou: %s", serie, e)
+        return None, None
+    desde = cob[1] if cob and cob[0] == len(indicadores) else None
+    return desde, (ult[0] if ult else None)
+
+def save_focus(serie: str, df: pd.DataFrame, indicadores=(), desde: str | None = None) -> None:
+    """
+    Upsert das linhas Focus (colunas de _FOCUS_COLS, data ISO).
+    Com `desde`, registra o início da janela coberta para cada um de `indicadores`.
+    """
+    rows = [(serie, *r) for r in df[_FOCUS_COLS].itertuples(index=False, name=None)]
+    try:
+        with _WRITE_LOCK, _connect() as con:
+            if rows:
+                con.executemany(
+                    "INSERT OR REPLACE INTO focus (serie, indicador, data, ref, mediana, minimo, maximo, desvio) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            if desde is not None:
+                con.executemany(
+                    "INSERT OR REPLACE INTO focus_cobertura (serie, indicador, desde) VALUES (?, ?, ?)",
+                    [(serie, ind, desde) for ind in indicadores])
+    except sqlite3.Error as e:
+        logger.warning("store: gravação Focus %s falhou: %s", serie, e)